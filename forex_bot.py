@@ -17,7 +17,7 @@ from src.core.system.auditor import SystemAuditor
 from src.core.system.monitor import BotStatusManager
 from src.core.ftmo_rule_manager import FTMORuleManager
 from src.utils.trading_logger import TradingLogger 
-from src.core.market.sessions import MarketSessionManager
+from src.core.market.sessions import get_manager as get_session_manager
 from src.signals.providers.evaluator import SignalEvaluator
 import time
 import keyboard
@@ -357,8 +357,8 @@ class ForexBot:
 
             # Always monitor FTMO status, even during closed markets
             ftmo_status = self.ftmo_manager.monitor_ftmo_status()
-            if 'error' in ftmo_status:
-                self.logger.error(f"FTMO monitoring error: {ftmo_status['error']}")
+            if ftmo_status.error:
+                self.logger.error(f"FTMO monitoring error: {ftmo_status.error}")
                 return
 
             # Get account info for FTMO monitoring
@@ -420,7 +420,7 @@ class ForexBot:
                 Trading Cycle Status:
                 Market Status: {'OPEN' if market_open else 'CLOSED'}
                 Active Sessions: {', '.join(session_info['active_sessions']) if market_open else 'None'}
-                FTMO Status: {ftmo_status.get('market_status', 'Unknown')}
+                FTMO Status: {ftmo_status.market_status}
                 """)
 
                 # Check existing positions regardless of market status
@@ -593,7 +593,7 @@ class ForexBot:
                 print("4. Restart the bot")
                 return
 
-            self.session_manager = MarketSessionManager()
+            self.session_manager = get_session_manager()
             
             # Set logging levels
             self.logger.setLevel(logging.ERROR)
@@ -1,12 +1,202 @@
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import logging
-import json
 import os
 import MetaTrader5 as mt5
-import traceback
+import numpy as np
 import time
+from bisect import bisect_right
+from collections import ChainMap, defaultdict
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+from operator import itemgetter
 from zoneinfo import ZoneInfo
+from src.utils.json_utils import json_dumps_pretty, json_loads
+from src.utils.time_utils import batch_utc_offset
+
+# Field extractors for per-position status rows
+_ticket_symbol = itemgetter('ticket', 'symbol')
+_duration_warning = itemgetter('duration', 'warning')
+
+# Status ladders as ascending thresholds; label index is bisect_right(thresholds, value)
+_DRAWDOWN_THRESHOLDS = (5, 7, 9)  # 50% / 70% / 90% of max drawdown
+_DRAWDOWN_LABELS = ('NORMAL', 'CAUTION', 'WARNING', 'CRITICAL')
+_PROFIT_THRESHOLDS = (50, 75, 100)
+_PROFIT_LABELS = ('IN_PROGRESS', 'ON_TRACK', 'NEAR_TARGET', 'TARGET_REACHED')
+_HIGH_DRAWDOWN_PERCENT = 8  # 80% of 10% max drawdown
+
+# Per-activity detail blocks for log_trading_activity, filled via str.format_map
+_ACTIVITY_TEMPLATES = {
+    'POSITION_OPEN': """
+                New Position:
+                Symbol: {symbol}
+                Type: {type}
+                Volume: {volume}
+                Entry Price: {entry_price}
+                SL: {stop_loss}
+                TP: {take_profit}
+                """,
+    'POSITION_CLOSE': """
+                Closed Position:
+                Ticket: {ticket}
+                Symbol: {symbol}
+                Profit/Loss: ${profit:.2f}
+                Duration: {duration}
+                """,
+    'DURATION_CHECK': """
+                Duration Check:
+                Ticket: {ticket}
+                Symbol: {symbol}
+                Current Duration: {duration}
+                Max Allowed: {max_position_duration}min
+                Status: {status}
+                """,
+    'LOSS_CHECK': """
+                Loss Check:
+                Daily Loss: ${abs_daily_loss:.2f}/{daily_loss_limit}
+                Total Loss: ${abs_total_loss:.2f}/{total_loss_limit}
+                Status: {status}
+                """
+}
+_ACTIVITY_FIELDS = (
+    'symbol', 'type', 'volume', 'entry_price', 'stop_loss', 'take_profit',
+    'ticket', 'duration'
+)
+_ACTIVITY_DEFAULTS = {
+    **dict.fromkeys(_ACTIVITY_FIELDS),
+    'profit': 0,
+    'status': 'OK'
+}
+
+_CENT = Decimal('0.01')
+
+_UTC = ZoneInfo('UTC')
+_EET_OFFSET_S = 7200  # MT5 server time (EET) is UTC+2
+_TIME_FMT = '%Y-%m-%d %H:%M:%S'
+
+# Account state cannot move while markets are shut; refresh weekend status hourly
+_WEEKEND_STATUS_TTL = timedelta(hours=1)
+
+# Parsed rules files keyed by (path, mtime); an edited file gets a new key
+_RULES_CACHE: Dict[tuple, Dict] = {}
+
+# Longest a trading days count is reused before MT5 history is queried again
+_TRADING_DAYS_TTL = 60.0
+
+# history_orders_get filters by setup time, so a pending order placed before the
+# newest one seen but filled later is only returned if the next query reaches back
+# to it; incremental scans re-query this many seconds behind the newest setup time
+_HISTORY_OVERLAP = 7 * 86400
+
+# date.toordinal() of 1970-01-01, for turning epoch day numbers into dates
+_EPOCH_ORDINAL = 719163
+
+# Batch duration checks switch to NumPy above this many positions
+_VECTORIZE_MIN_POSITIONS = 32
+
+def _aggregate_fills(orders, counted: Dict[int, int]) -> tuple:
+    """
+    Sum filled order volume per local calendar day
+
+    Fills whose ticket is already in counted are skipped. Returns (volume by
+    date, {ticket: time_setup} of the fills summed).
+    """
+    fills = [
+        (order.time_setup, order.volume_initial, order.ticket)
+        for order in orders
+        if order.state == mt5.ORDER_STATE_FILLED and order.ticket not in counted
+    ]
+    if not fills:
+        return {}, {}
+
+    # Bucket by whole local days: shift to wall-clock seconds once per batch,
+    # or convert per fill when the batch spans a DST change
+    times = [ts for ts, _, _ in fills]
+    utc_offset = batch_utc_offset(min(times), max(times))
+    volumes: Dict[date, float] = defaultdict(float)
+    if utc_offset is None:
+        for ts, volume, _ in fills:
+            volumes[date.fromtimestamp(ts)] += volume
+    else:
+        day_volumes = defaultdict(float)
+        for ts, volume, _ in fills:
+            day_volumes[(ts + utc_offset) // 86400] += volume
+        for day_id, volume in day_volumes.items():
+            volumes[date.fromordinal(_EPOCH_ORDINAL + day_id)] = volume
+
+    return dict(volumes), {ticket: ts for ts, _, ticket in fills}
+
+def _fmt_duration(total_seconds: float) -> str:
+    """Format elapsed seconds as 'Xh Ym'"""
+    return "%dh %dm" % divmod(int(total_seconds // 60), 60)
+
+@lru_cache(maxsize=4096)
+def _parse_position_time(value: str) -> datetime:
+    """Parse a fixed 'YYYY-MM-DD HH:MM:SS' position time, or an epoch-seconds string"""
+    try:
+        if len(value) != 19 or value[10] not in ' T':
+            raise ValueError(value)
+        return datetime(
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19])
+        )
+    except ValueError:
+        return datetime.fromtimestamp(float(value))
+
+@dataclass(slots=True, frozen=True)
+class AccountStatus:
+    """Account balances and loss usage at the time of a status check"""
+    balance: float
+    equity: float
+    daily_loss_used: float
+    daily_loss_limit: float
+    total_loss_limit: float
+    drawdown: float
+    drawdown_percent: float
+
+@dataclass(slots=True, frozen=True)
+class TradingProgress:
+    """Progress towards the minimum trading days requirement"""
+    days_completed: int
+    days_remaining: int
+    min_required: int
+
+@dataclass(slots=True, frozen=True)
+class RulesStatus:
+    """Static FTMO limits reported alongside a status check"""
+    position_duration_limit: str
+    max_positions: int
+
+@dataclass(slots=True, frozen=True)
+class FTMOStatus:
+    """Result of FTMORuleManager.monitor_ftmo_status"""
+    timestamp: str
+    market_status: str = 'Unknown'
+    account_status: Optional[AccountStatus] = None
+    trading_progress: Optional[TradingProgress] = None
+    rules_status: Optional[RulesStatus] = None
+    warnings: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """Nested dict form of the status, omitting unset sections"""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+    def to_report(self) -> Dict:
+        """
+        to_dict() with account amounts as cent-quantized Decimals
+
+        Monitoring math stays in floats; Decimal is only produced here for
+        reporting consumers that need exact currency values.
+        """
+        report = self.to_dict()
+        if self.account_status is not None:
+            report['account_status'] = {
+                key: Decimal(repr(value)).quantize(_CENT)
+                for key, value in report['account_status'].items()
+            }
+        return report
 
 class FTMORuleManager:
     def __init__(self, config_dir: str = "config"):
@@ -19,10 +209,14 @@ class FTMORuleManager:
         self.config_dir = config_dir
         self.rules_file = os.path.join(config_dir, "ftmo_rules.json")
         self.mt5_trader = None
+        self.position_manager = None  # optional PositionManager, attached by the bot
+        self.status_manager = None  # optional BotStatusManager for action logging
+        self._queued_closures: Dict[int, float] = {}  # ticket -> time queued
         
         # Load rules
         self.rules = self._load_rules()
         self.logger.info("FTMO rules loaded successfully")
+        self._cache_rule_limits()
         
         # Initialize stats
         self.daily_stats = {
@@ -31,6 +225,20 @@ class FTMORuleManager:
             'max_drawdown': 0
         }
         self.last_reset = datetime.now()
+        self.peak_balance = None  # highest balance seen, set on the first monitor pass
+        self._high_drawdown_level = float('-inf')  # values at or below this are a high drawdown
+        self.daily_equity_high = None  # highest equity seen, set on the first drawdown check
+        self._weekend_cache = (None, False)  # (date, is_weekend)
+        self._last_status_cache = None  # (taken_at, FTMOStatus)
+        self._now = None  # wall-clock time of the current monitoring pass
+        self._now_str = None  # _now as local time in _TIME_FMT
+        self._now_utc_str = None  # _now as UTC time in _TIME_FMT
+        self._history_scanned_at = None  # (monotonic time, date) of the last history scan
+        self._history_daily_volumes: Dict[date, float] = {}  # filled volume per trading day
+        self._last_history_ts = 0  # newest filled order time_setup seen
+        self._history_tickets: Dict[int, int] = {}  # counted fills still inside the re-query overlap -> time_setup
+        self._history_window = (None, None)  # (hour bucket, 30-day window start)
+        self._tick_cache = {}  # key -> (monotonic time, value) for per-tick MT5 lookups
 
         # Initialize FTMO Logger
         from src.utils.ftmo_logger import FTMOLogger
@@ -38,7 +246,8 @@ class FTMORuleManager:
         self.logger.info("FTMO Logger initialized")
         
         # Log initialization details
-        self.logger.info(f"""
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"""
         FTMO Manager Initialized:
         Max Position Duration: {self.rules['time_rules']['max_position_duration']} minutes
         Daily Loss Limit: ${abs(self.rules['trading_rules']['max_daily_loss'])}
@@ -46,6 +255,49 @@ class FTMORuleManager:
         Position Duration Warning: {self.rules['trading_rules']['position_duration']['warning_threshold'] * 100}%
         """)
 
+    def _tick(self) -> datetime:
+        """Capture the wall-clock time shared by one monitoring pass"""
+        self._now = datetime.now()
+        self._now_str = self._now.strftime(_TIME_FMT)
+        self._now_utc_str = self._now.astimezone(_UTC).strftime(_TIME_FMT)
+        return self._now
+
+    def _cached_lookup(self, key: str, fetch, ttl: float = 1.0):
+        """Result of fetch(), reused for ttl seconds under key"""
+        now = time.monotonic()
+        cached = self._tick_cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+        value = fetch()
+        self._tick_cache[key] = (now, value)
+        return value
+
+    def _cached_tick(self, symbol: str, ttl: float = 1.0):
+        """mt5.symbol_info_tick(symbol), reused for ttl seconds"""
+        return self._cached_lookup(symbol, lambda: mt5.symbol_info_tick(symbol), ttl)
+
+    def _cached_session(self, ttl: float = 1.0) -> str:
+        """Current market session from the MT5 trader, reused for ttl seconds"""
+        get_session = getattr(self.mt5_trader, '_get_current_session', None)
+        if get_session is None:
+            return 'Unknown'
+        return self._cached_lookup('_session', get_session, ttl)
+
+    def _fetch_positions(self) -> List[Dict]:
+        """Open positions from the position manager, or the MT5 trader as a fallback"""
+        if self.position_manager is not None:
+            return self.position_manager.get_open_positions()
+        get_positions = getattr(self.mt5_trader, 'get_positions', None)
+        return get_positions() if get_positions is not None else []
+
+    def _positions_snapshot(self, ttl: float = 1.0) -> List[Dict]:
+        """Open positions shared by the monitors within one tick"""
+        return self._cached_lookup('_positions', self._fetch_positions, ttl)
+
+    def _invalidate_positions(self):
+        """Force the next _positions_snapshot to refetch"""
+        self._tick_cache.pop('_positions', None)
+
     def set_mt5_trader(self, mt5_trader):
         """Set MT5 trader instance for position management"""
         self.mt5_trader = mt5_trader
@@ -53,8 +305,9 @@ class FTMORuleManager:
 
     def _setup_logging(self):
         """Setup centralized logging for FTMO rule manager"""
-        from src.utils.logger import setup_logger, get_implementation_logger
-        self.logger = setup_logger('FTMORuleManager')
+        from src.utils.logger import enable_async_logging, get_implementation_logger
+        # Monitor ticks log heavily; hand file I/O to a background listener
+        self.logger = enable_async_logging('FTMORuleManager')
         impl_logger = get_implementation_logger()
         impl_logger.info("FTMORuleManager logging configured with centralized system")
     
@@ -99,30 +352,11 @@ class FTMORuleManager:
         try:
             self.logger.info("Checking trading days requirement...")
             
-            # Get trading activity from last 30 days
-            from datetime import datetime, timedelta
-            start_date = datetime.now() - timedelta(days=30)
-            
-            # Use MT5's native history orders function
-            history_orders = mt5.history_orders_get(
-                start_date,
-                datetime.now()
-            )
-            
-            if history_orders is None:
-                history_orders = []
-                
-            self.logger.info(f"Retrieved {len(history_orders)} historical orders")
-            
-            # Track unique trading days
-            trading_days = set()
-            for order in history_orders:
-                if order.state == mt5.ORDER_STATE_FILLED:
-                    trade_date = datetime.fromtimestamp(order.time_setup).date()
-                    trading_days.add(trade_date)
+            # Trading activity from the last 30 days
+            trading_days, _ = self._scan_history_30d()
 
             # Calculate trading days metrics
-            min_required = self.rules['trading_rules'].get('min_trading_days', 4)
+            min_required = self._min_trading_days
             days_completed = len(trading_days)
             days_remaining = max(0, min_required - days_completed)
 
@@ -131,15 +365,16 @@ class FTMORuleManager:
                 'days_completed': days_completed,
                 'days_required': min_required,
                 'days_remaining': days_remaining,
-                'trading_activity': sorted(list(trading_days))
+                'trading_activity': sorted(trading_days)
             }
 
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             Trading Days Requirement Status:
             Status: {result['status']}
             Progress: {days_completed}/{min_required} days
             Remaining: {days_remaining} days
-            Trading Dates: {', '.join(d.strftime('%Y-%m-%d') for d in result['trading_activity'])}
+            Trading Dates: {', '.join(map(date.isoformat, result['trading_activity']))}
             """)
 
             return result
@@ -149,81 +384,108 @@ class FTMORuleManager:
             return {
                 'status': 'ERROR',
                 'days_completed': 0,
-                'days_required': self.rules['trading_rules'].get('min_trading_days', 4),
-                'days_remaining': self.rules['trading_rules'].get('min_trading_days', 4),
+                'days_required': self._min_trading_days,
+                'days_remaining': self._min_trading_days,
                 'error': str(e)
             }
 
     def _load_rules(self) -> Dict:
+        """Load FTMO rules, reusing the parsed file while it is unchanged on disk"""
         try:
-            with open(self.rules_file, 'r') as f:
-                return json.load(f)
+            cache_key = (self.rules_file, os.stat(self.rules_file).st_mtime)
+            rules = _RULES_CACHE.get(cache_key)
+            if rules is None:
+                with open(self.rules_file, 'rb') as f:
+                    rules = json_loads(f.read())
+                _RULES_CACHE[cache_key] = rules
+            return rules
         except FileNotFoundError:
             raise RuntimeError("FTMO rules configuration file not found")
 
+    def _cache_rule_limits(self):
+        """Bind frequently used rule values to flat attributes"""
+        trading_rules = self.rules['trading_rules']
+        monitoring = self.rules.get('monitoring', {})
+        self._max_duration = self.rules['time_rules']['max_position_duration']
+        self._warn_thresh = trading_rules['position_duration']['warning_threshold']
+        self._warning_threshold_minutes = self._max_duration * self._warn_thresh
+        self._max_daily_loss = trading_rules['max_daily_loss']
+        self._max_total_loss = trading_rules['max_total_loss']
+        self._max_lots = trading_rules['scaling_rules']['max_lots']
+        self._max_positions = trading_rules['max_positions']
+        self._min_trading_days = trading_rules.get('min_trading_days', 4)
+        self._profit_target = trading_rules.get('profit_target', 1000)
+        self._warn_daily = monitoring.get('warning_threshold_daily')
+        self._warn_total = monitoring.get('warning_threshold_total')
+        self._max_daily_loss_abs = abs(self._max_daily_loss)
+        self._max_total_loss_abs = abs(self._max_total_loss)
+        self._daily_warn_level = self._max_daily_loss_abs * 0.8
+        self._total_warn_level = self._max_total_loss_abs * 0.8
+
     def check_position_allowed(self, account_info: Dict, position_size: float) -> tuple[bool, str]:
         """Check if position is allowed based on FTMO rules"""
         try:
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"""
             ================ POSITION CHECK START ================
             Account State:
             - Current Profit: ${account_info['profit']:.2f}
-            - Daily Loss Limit: ${abs(self.rules['trading_rules']['max_daily_loss']):.2f}
+            - Daily Loss Limit: ${self._max_daily_loss_abs:.2f}
             - Position Size: {position_size}
-            - Max Size Allowed: {self.rules['trading_rules']['scaling_rules']['max_lots']}
+            - Max Size Allowed: {self._max_lots}
             """)
 
-            result = True
-            message = "Position allowed"
-
-            if account_info['profit'] <= self.rules['trading_rules']['max_daily_loss']:
-                result = False
-                message = "Daily loss limit reached"
-                self.logger.warning(f"Daily loss limit reached: ${account_info['profit']:.2f}")
+            profit = account_info['profit']
+            balance = account_info['balance']
 
-            if account_info['balance'] <= self.rules['trading_rules']['max_total_loss']:
-                result = False
-                message = "Total loss limit reached"
-                self.logger.warning(f"Total loss limit reached: ${account_info['balance']:.2f}")
+            # Checked in reverse so the reported reason matches the old
+            # last-failure-wins order when several limits are hit
+            if position_size > self._max_lots:
+                self.logger.warning("Position size %s exceeds max allowed %s", position_size, self._max_lots)
+                return False, "Position size exceeds maximum allowed"
 
-            if position_size > self.rules['trading_rules']['scaling_rules']['max_lots']:
-                result = False
-                message = "Position size exceeds maximum allowed"
-                self.logger.warning(f"Position size {position_size} exceeds max allowed {self.rules['trading_rules']['scaling_rules']['max_lots']}")
+            if balance <= self._max_total_loss:
+                self.logger.warning("Total loss limit reached: $%.2f", balance)
+                return False, "Total loss limit reached"
 
-            self.logger.info(f"""
-            Position Check Result:
-            - Allowed: {result}
-            - Reason: {message}
-            ================ POSITION CHECK END ================
-            """)
+            if profit <= self._max_daily_loss:
+                self.logger.warning("Daily loss limit reached: $%.2f", profit)
+                return False, "Daily loss limit reached"
 
-            return result, message
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Position check passed: size %s, profit %.2f", position_size, profit)
+            return True, "Position allowed"
 
         except Exception as e:
-            self.logger.error(f"""
-            Position Check Error:
-            Error: {str(e)}
-            Traceback: {traceback.format_exc()}
-            """)
+            self.logger.error("Position check error - %s: %s", type(e).__name__, e)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Position check traceback", exc_info=True)
             return False, f"Error checking position: {str(e)}"
     
-    def check_position_duration(self, position: Dict) -> Dict:
+    def check_position_duration(self, position: Dict, now: Optional[datetime] = None) -> Dict:
         """Enhanced position duration check with detailed time logging"""
         try:
-            from zoneinfo import ZoneInfo  # Import at the start of the method
+            if now is None:
+                now = datetime.now()
 
-            self.logger.info(f"""
+            # Detail blocks below are diagnostic only; skip building them unless DEBUG is on
+            log_debug = self.logger.isEnabledFor(logging.DEBUG)
+
+            if log_debug:
+                local_now = now
+                utc_now = now.astimezone(_UTC)
+                market_open = getattr(self.mt5_trader, 'market_is_open', 'Unknown')
+                self.logger.debug(f"""
             ================== DURATION CHECK START ==================
             Position: {position['ticket']}
             Market Conditions:
-            - Current Session: {self.mt5_trader._get_current_session() if hasattr(self.mt5_trader, '_get_current_session') else 'Unknown'}
-            - Market Open: {self.mt5_trader.market_is_open if hasattr(self.mt5_trader, 'market_is_open') else 'Unknown'}
-            - Server Time: {datetime.now()}
+            - Current Session: {self._cached_session()}
+            - Market Open: {market_open}
+            - Server Time: {now}
             """)
 
-            # Add detailed position logging
-            self.logger.info(f"""
+                # Add detailed position logging
+                self.logger.debug(f"""
             Position Raw Data:
             - Ticket: {position.get('ticket')}
             - Symbol: {position.get('symbol')}
@@ -232,12 +494,10 @@ class FTMORuleManager:
             - Raw Time Type: {type(position.get('time'))}
             """)
 
-            # Log timezone information
-            server_now = datetime.fromtimestamp(mt5.symbol_info_tick("EURUSD").time)
-            local_now = datetime.now()
-            utc_now = datetime.now(ZoneInfo('UTC'))
+                # Log timezone information
+                server_now = datetime.fromtimestamp(self._cached_tick("EURUSD").time)
 
-            self.logger.info(f"""
+                self.logger.debug(f"""
             Current Time Information:
             - Local Time: {local_now}
             - Server Time (EET): {server_now}
@@ -247,62 +507,48 @@ class FTMORuleManager:
             * Local to Server: {(server_now - local_now).total_seconds()} seconds
             * Local to UTC: {(utc_now.replace(tzinfo=None) - local_now).total_seconds()} seconds
             """)
-            
-            # Get current time in UTC
-            current_time = datetime.now(ZoneInfo("UTC"))
-            
-            # Convert MT5 server time (EET/UTC+2) to UTC
-            if isinstance(position['time'], (int, float)):
-                # Log raw timestamp handling
-                self.logger.info(f"""
-                Timestamp Conversion:
-                - Raw Timestamp: {position['time']}
-                - As Local: {datetime.fromtimestamp(position['time'])}
-                - As Server (EET): {datetime.fromtimestamp(position['time'])}
-                - As UTC: {datetime.fromtimestamp(position['time'] - 7200)}
-                """)
 
-                # Subtract 2 hours (7200 seconds) from the timestamp to convert from EET to UTC
-                utc_timestamp = position['time'] - 7200
-                open_time = datetime.fromtimestamp(utc_timestamp, ZoneInfo("UTC"))
-                
-                self.logger.info(f"""
-                Time Conversion Result:
-                - UTC Timestamp: {utc_timestamp}
-                - Converted Open Time: {open_time}
-                - Current Time: {current_time}
-                """)
-            else:
-                try:
-                    open_time = datetime.strptime(position['time'], '%Y-%m-%d %H:%M:%S')
-                    open_time = open_time.replace(tzinfo=ZoneInfo("UTC"))
-                    self.logger.info(f"Parsed string time to datetime: {open_time}")
-                except ValueError as e:
-                    self.logger.error(f"Time parsing error: {e}")
-                    return self._get_default_result()
+            # Open time as UTC epoch seconds; MT5 server timestamps are EET (UTC+2)
+            raw_time = position['time']
+            open_ts = self._position_open_ts(position)
+            if open_ts != open_ts:  # NaN: unparseable open time
+                self.logger.error("Time parsing error for position %s: %r",
+                                  position.get('ticket', 'unknown'), raw_time)
+                return self._get_default_result()
 
             # Calculate duration
-            duration = current_time - open_time
-            duration_minutes = duration.total_seconds() / 60
-            
+            duration_seconds = now.timestamp() - open_ts
+            duration_minutes = duration_seconds / 60
+
             # Format duration string
-            hours = int(duration_minutes // 60)
-            minutes = int(duration_minutes % 60)
-            duration_str = f"{hours}h {minutes}m"
+            duration_str = _fmt_duration(duration_seconds)
 
-            self.logger.info(f"""
+            if log_debug:
+                open_time = datetime.fromtimestamp(open_ts, _UTC)
+                self.logger.debug(f"""
             Duration Calculation:
+            - Raw Time: {raw_time}
             - Open Time (UTC): {open_time}
-            - Current Time (UTC): {current_time}
-            - Duration: {duration}
+            - Current Time (UTC): {utc_now}
+            - Duration: {timedelta(seconds=duration_seconds)}
             - Total Minutes: {duration_minutes}
             - Formatted: {duration_str}
-            - Raw Duration Seconds: {duration.total_seconds()}
+            - Raw Duration Seconds: {duration_seconds}
             """)
 
             # Calculate warning threshold
-            max_duration = self.rules['time_rules']['max_position_duration']
-            warning_threshold = max_duration * self.rules['trading_rules']['position_duration']['warning_threshold']
+            max_duration = self._max_duration
+            warning_threshold = self._warning_threshold_minutes
+
+            # Reuse the raw string when it is already in canonical form
+            if isinstance(raw_time, str) and len(raw_time) == 19 and raw_time[10] == ' ':
+                open_time_str = raw_time
+            else:
+                open_time_str = datetime.fromtimestamp(open_ts, _UTC).strftime(_TIME_FMT)
+            if now is self._now:
+                utc_time_str = self._now_utc_str
+            else:
+                utc_time_str = now.astimezone(_UTC).strftime(_TIME_FMT)
 
             # Create result
             result = {
@@ -310,16 +556,17 @@ class FTMORuleManager:
                 'duration': duration_str,
                 'duration_minutes': duration_minutes,
                 'max_duration': max_duration,
-                'open_time': open_time.strftime('%Y-%m-%d %H:%M:%S'),
+                'open_time': open_time_str,
                 'warning': duration_minutes >= warning_threshold,
                 'timezone_info': {
-                    'utc_time': current_time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'position_time': open_time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'utc_time': utc_time_str,
+                    'position_time': open_time_str,
                     'timezone': 'UTC'
                 }
             }
 
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             Duration Check Result:
             - Needs Closure: {result['needs_closure']}
             - Warning Active: {result['warning']}
@@ -332,22 +579,73 @@ class FTMORuleManager:
             return result
 
         except Exception as e:
-            self.logger.error(f"""
-            Duration Check Error:
-            Position: {position.get('ticket', 'unknown')}
-            Error: {str(e)}
-            Traceback: {traceback.format_exc()}
-            ================== DURATION CHECK END ==================
-            """)
+            self.logger.error("Duration check error for position %s - %s: %s",
+                              position.get('ticket', 'unknown'), type(e).__name__, e)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Duration check traceback", exc_info=True)
             return self._get_default_result()
 
+    def _position_open_ts(self, position: Dict) -> float:
+        """Position open time as UTC epoch seconds, NaN when it cannot be parsed"""
+        try:
+            raw_time = position['time']
+            if isinstance(raw_time, (int, float)):
+                return raw_time - _EET_OFFSET_S  # MT5 server timestamps are EET (UTC+2)
+            return _parse_position_time(raw_time).replace(tzinfo=_UTC).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return float('nan')
+
+    def check_positions_duration_batch(self, positions: List[Dict],
+                                       now: Optional[datetime] = None) -> List[Dict]:
+        """
+        Duration check for many positions against a single time snapshot
+
+        Args:
+            positions: Position dicts as returned by the MT5 trader
+            now: Time to measure against, defaults to the current time
+
+        Returns:
+            One dict per position, in order, with the duration keys of
+            check_position_duration. Positions without a usable open time
+            get the default result.
+        """
+        now_ts = (now or datetime.now()).timestamp()
+        max_duration = self._max_duration
+        warning_threshold = self._warning_threshold_minutes
+        open_times = [self._position_open_ts(position) for position in positions]
+
+        if len(open_times) > _VECTORIZE_MIN_POSITIONS:
+            minutes_arr = (now_ts - np.fromiter(open_times, dtype=np.float64, count=len(open_times))) / 60.0
+            minutes = minutes_arr.tolist()
+            needs_closure = (minutes_arr >= max_duration).tolist()
+            warnings = (minutes_arr >= warning_threshold).tolist()
+        else:
+            minutes = [(now_ts - open_ts) / 60.0 for open_ts in open_times]
+            needs_closure = [value >= max_duration for value in minutes]
+            warnings = [value >= warning_threshold for value in minutes]
+
+        results = []
+        for open_ts, duration_minutes, closure, warning in zip(open_times, minutes, needs_closure, warnings):
+            if open_ts != open_ts:  # NaN: unparseable open time
+                results.append(self._get_default_result())
+                continue
+            results.append({
+                'needs_closure': closure,
+                'duration': _fmt_duration(duration_minutes * 60),
+                'duration_minutes': duration_minutes,
+                'max_duration': max_duration,
+                'open_time': datetime.fromtimestamp(open_ts, _UTC).strftime(_TIME_FMT),
+                'warning': warning
+            })
+        return results
+
     def _get_default_result(self):
         """Default result for error cases"""
         return {
             'needs_closure': False,
             'duration': "0h 0m",
             'duration_minutes': 0,
-            'max_duration': self.rules['time_rules']['max_position_duration'],
+            'max_duration': self._max_duration,
             'open_time': "Unknown",
             'warning': False,
             'error': True
@@ -355,172 +653,144 @@ class FTMORuleManager:
 
     def _add_to_queued_closures(self, ticket: int):
         """Add position to queued closures list"""
-        if not hasattr(self, '_queued_closures'):
-            self._queued_closures = set()
-        self._queued_closures.add(ticket)
-        self.logger.info(f"Added position {ticket} to queued closures")
+        self._queued_closures.setdefault(ticket, time.time())
+        self._invalidate_positions()
+        self.logger.info("Added position %s to queued closures", ticket)
 
     def process_queued_closures(self) -> List[Dict]:
         """
         Process positions queued for closure when market opens
         Returns: List of closure attempts and their results
         """
-        if not hasattr(self, '_queued_closures') or not self._queued_closures:
+        if not self._queued_closures:
             return []
             
-        if not hasattr(self, 'mt5_trader') or not self.mt5_trader.market_is_open:
+        if self.mt5_trader is None or not self.mt5_trader.market_is_open:
             self.logger.info("Market still closed - keeping positions in queue")
             return []
             
-        results = []
-        for ticket in list(self._queued_closures):
+        self._tick()
+        timestamp = self._now_str
+        tickets = list(self._queued_closures)
+
+        # One round trip when the trader can close several positions at once
+        close_trades = getattr(self.mt5_trader, 'close_trades', None)
+        if close_trades is not None:
             try:
-                success, message = self.mt5_trader.close_trade(ticket)
-                result = {
-                    'ticket': ticket,
-                    'success': success,
-                    'message': message,
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                results.append(result)
-                
-                if success:
-                    self._queued_closures.remove(ticket)
-                    self.logger.info(f"Successfully closed queued position {ticket}")
-                else:
-                    self.logger.error(f"Failed to close queued position {ticket}: {message}")
-                    
+                outcomes = list(close_trades(tickets))
             except Exception as e:
-                self.logger.error(f"Error processing queued closure for position {ticket}: {str(e)}")
-                results.append({
-                    'ticket': ticket,
-                    'success': False,
-                    'message': str(e),
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
-                
+                self.logger.error(f"Error processing queued closures: {str(e)}")
+                outcomes = [(ticket, False, str(e)) for ticket in tickets]
+        else:
+            outcomes = []
+            for ticket in tickets:
+                try:
+                    outcomes.append((ticket, *self.mt5_trader.close_trade(ticket)))
+                except Exception as e:
+                    self.logger.error(f"Error processing queued closure for position {ticket}: {str(e)}")
+                    outcomes.append((ticket, False, str(e)))
+
+        results = []
+        for ticket, success, message in outcomes:
+            results.append({
+                'ticket': ticket,
+                'success': success,
+                'message': message,
+                'timestamp': timestamp
+            })
+
+            if success:
+                self._queued_closures.pop(ticket, None)
+                self._invalidate_positions()
+                self.invalidate_trading_days_cache()
+                self.logger.info("Successfully closed queued position %s", ticket)
+            else:
+                self.logger.error("Failed to close queued position %s: %s", ticket, message)
+
         return results
 
     def get_queued_closures(self) -> List[Dict]:
         """Get list of positions queued for closure"""
         try:
-            queued_closures = []
-            positions = self.mt5_trader.get_positions()
-            
-            for position in positions:
-                duration_check = self.check_position_duration(position)
-                if duration_check.get('needs_closure', False):
-                    queued_closures.append({
-                        'ticket': position['ticket'],
-                        'symbol': position['symbol'],
-                        'duration': duration_check['duration'],
-                        'queued_since': duration_check['open_time']
-                    })
+            now = self._tick()
+            positions = self._positions_snapshot()
+            checks = self.check_positions_duration_batch(positions, now)
+            queued_closures = [
+                {
+                    'ticket': position['ticket'],
+                    'symbol': position['symbol'],
+                    'duration': check['duration'],
+                    'queued_since': check['open_time']
+                }
+                for position, check in zip(positions, checks)
+                if check['needs_closure']
+            ]
                     
-            self.logger.info(f"Found {len(queued_closures)} positions queued for closure")
+            self.logger.info("Found %d positions queued for closure", len(queued_closures))
             return queued_closures
             
         except Exception as e:
             self.logger.error(f"Error getting queued closures: {str(e)}")
             return []
 
-    def get_position_metrics(self, position: Dict) -> Dict:
+    def get_position_metrics(self, position: Dict, now: Optional[datetime] = None) -> Dict:
         """Calculate position metrics with proper timezone handling"""
         try:
-            self.logger.info(f"""
+            if now is None:
+                now = datetime.now()
+            log_debug = self.logger.isEnabledFor(logging.DEBUG)
+
+            if log_debug:
+                # MT5 terminal and server time are diagnostic only; fetch them once per tick
+                utc_now = now.astimezone(_UTC)
+                terminal_info = self._cached_lookup('_terminal', mt5.terminal_info)
+                terminal_dict = terminal_info._asdict() if terminal_info else {}
+                server_tick = self._cached_tick("EURUSD")
+                server_time = datetime.fromtimestamp(server_tick.time if server_tick else 0)
+
+                self.logger.debug(f"""
             ========== POSITION METRICS CALCULATION START ==========
             Position Ticket: {position.get('ticket')}
             Raw Position Time: {position.get('time')}
-            Current Time: {datetime.now()}
-            """)
 
-            # Log MT5 server information (keeping existing logs)
-            terminal_info = mt5.terminal_info()
-            if terminal_info:
-                terminal_dict = terminal_info._asdict()
-                self.logger.info(f"""
-                MT5 Server Information:
-                Path: {terminal_dict.get('path')}
-                Data Path: {terminal_dict.get('data_path')}
-                Connected: {terminal_dict.get('connected')}
-                """)
+            MT5 Server Information:
+            Path: {terminal_dict.get('path')}
+            Data Path: {terminal_dict.get('data_path')}
+            Connected: {terminal_dict.get('connected')}
 
-            # Enhanced timezone logging
-            local_tz = datetime.now().astimezone().tzinfo
-            utc_now = datetime.now(ZoneInfo('UTC'))
-            server_time = datetime.fromtimestamp(mt5.symbol_info_tick("EURUSD").time if mt5.symbol_info_tick("EURUSD") else 0)
-            
-            self.logger.info(f"""
-            Enhanced Timezone Information:
-            Local TZ: {local_tz}
-            Local Time: {datetime.now()}
+            Timezone Information:
+            Local TZ: {now.astimezone().tzinfo}
+            Local Time: {now}
             UTC Time: {utc_now}
             Server Time (EET): {server_time}
-            UTC Offset: {datetime.now(ZoneInfo('UTC')).utcoffset()}
             """)
 
-            # Handle timestamp conversion with enhanced logging
-            if isinstance(position['time'], str):
-                try:
-                    open_time = datetime.strptime(position['time'], '%Y-%m-%d %H:%M:%S')
-                    self.logger.info(f"Parsed string time to datetime: {open_time}")
-                except ValueError:
-                    open_time = datetime.fromtimestamp(float(position['time']))
-                    self.logger.info(f"Converted string timestamp to datetime: {open_time}")
-            else:
-                # Convert EET to UTC for proper comparison
-                raw_timestamp = position['time']
-                server_time = datetime.fromtimestamp(raw_timestamp)
-                utc_time = datetime.fromtimestamp(raw_timestamp - 7200)  # Convert EET to UTC
-                
-                self.logger.info(f"""
-                Enhanced Timestamp Conversion Steps:
-                1. Raw Timestamp: {raw_timestamp}
-                2. Server Time (EET): {server_time}
-                3. UTC Time: {utc_time}
-                4. Timestamp Type: {type(position['time'])}
-                5. EET to UTC Offset Applied: -7200 seconds
-                """)
-                
-                open_time = utc_time  # Use UTC time for comparison
-                self.logger.info(f"Final converted UTC open time: {open_time}")
-            
-            # Convert current time to UTC for comparison
-            current_time = datetime.now(ZoneInfo('UTC'))
-            current_time = current_time.replace(tzinfo=None)  # Strip timezone for comparison
-            
-            self.logger.info(f"""
-            Time Comparison Setup:
-            Open Time (UTC): {open_time}
-            Current Time (UTC): {current_time}
-            """)
-            
-            duration = current_time - open_time
-            
-            total_minutes = int(duration.total_seconds() / 60)
-            hours = total_minutes // 60
-            minutes = total_minutes % 60
-            duration_str = f"{hours}h {minutes}m"
+            # Open time as UTC epoch seconds; MT5 server timestamps are EET (UTC+2)
+            open_ts = self._position_open_ts(position)
+            if open_ts != open_ts:  # NaN: unparseable open time
+                raise ValueError(f"Unparseable position time: {position.get('time')!r}")
+            open_time = datetime.fromtimestamp(open_ts, _UTC)
 
-            self.logger.info(f"""
+            duration_seconds = now.timestamp() - open_ts
+            total_minutes = int(duration_seconds / 60)
+            duration_str = _fmt_duration(duration_seconds)
+
+            if log_debug:
+                self.logger.debug(f"""
             Time Calculations:
-            Open Time: {open_time}
-            Current Time: {current_time}
+            Raw Position Time: {position['time']}
+            Open Time (UTC): {open_time}
+            Current Time (UTC): {utc_now}
             Duration Total Minutes: {total_minutes}
             Formatted Duration: {duration_str}
             
             Raw Duration Data:
-            Total Seconds: {duration.total_seconds()}
-            Days: {duration.days}
-            Seconds: {duration.seconds}
-            
-            Additional Time Debug:
-            Open Time Timestamp: {open_time.timestamp()}
-            Current Time Timestamp: {current_time.timestamp()}
-            Time Difference (seconds): {current_time.timestamp() - open_time.timestamp()}
+            Total Seconds: {duration_seconds}
+            Open Time Timestamp: {open_ts}
+            Current Time Timestamp: {now.timestamp()}
             """)
 
-            max_duration = self.rules['time_rules']['max_position_duration']
+            max_duration = self._max_duration
             within_limit = total_minutes <= max_duration
 
             result = {
@@ -530,9 +800,10 @@ class FTMORuleManager:
                 'total_minutes': total_minutes
             }
 
-            self.logger.info(f"""
+            if log_debug:
+                self.logger.debug(f"""
             Final Metrics:
-            {json.dumps(result, indent=2)}
+            {json_dumps_pretty(result)}
             ========== POSITION METRICS CALCULATION END ==========
             """)
                 
@@ -581,18 +852,18 @@ class FTMORuleManager:
             # Update max drawdown if needed
             if current_profit < self.daily_stats['max_drawdown']:
                 self.daily_stats['max_drawdown'] = current_profit
-                self.logger.warning(f"New maximum drawdown reached: ${current_profit:.2f}")
+                self.logger.warning("New maximum drawdown reached: $%.2f", current_profit)
 
             # Calculate warning thresholds
-            daily_limit = abs(self.rules['trading_rules']['max_daily_loss'])
-            total_limit = abs(self.rules['trading_rules']['max_total_loss'])
-            daily_warning = daily_limit * 0.8  # 80% of daily limit
-            total_warning = total_limit * 0.8  # 80% of total limit
+            daily_limit = self._max_daily_loss_abs
+            total_limit = self._max_total_loss_abs
+            daily_warning = self._daily_warn_level  # 80% of daily limit
 
             # Log detailed status
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             Daily Performance Update:
-            Time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}
+            Time: {current_time.strftime(_TIME_FMT)}
             Current Profit: ${current_profit:.2f}
             Max Drawdown: ${self.daily_stats['max_drawdown']:.2f}
             Daily Limit: ${daily_limit:.2f}
@@ -600,26 +871,27 @@ class FTMORuleManager:
             """)
 
             # Check and log warnings
-            if abs(current_profit) >= daily_warning:
-                warning_msg = f"WARNING: Approaching daily loss limit - Current: ${abs(current_profit):.2f} / Limit: ${daily_limit:.2f}"
+            abs_profit = -current_profit if current_profit < 0 else current_profit
+            if abs_profit >= daily_warning:
+                warning_msg = f"WARNING: Approaching daily loss limit - Current: ${abs_profit:.2f} / Limit: ${daily_limit:.2f}"
                 self.logger.warning(warning_msg)
-                if hasattr(self, 'status_manager'):
+                if self.status_manager is not None:
                     self.status_manager.log_action(warning_msg)
 
-            if account_info['balance'] <= self.rules['monitoring']['warning_threshold_total']:
+            if account_info['balance'] <= self._warn_total:
                 warning_msg = f"WARNING: Approaching total loss limit - Current: ${abs(account_info['balance']):.2f} / Limit: ${total_limit:.2f}"
                 self.logger.warning(warning_msg)
-                if hasattr(self, 'status_manager'):
+                if self.status_manager is not None:
                     self.status_manager.log_action(warning_msg)
 
             # Log daily summary if positions closed
-            if not self.daily_stats.get('trading_day_logged') and len(self.position_manager.get_open_positions()) > 0:
+            if not self.daily_stats.get('trading_day_logged') and len(self._positions_snapshot()) > 0:
                 self.daily_stats['trading_day_logged'] = True
                 self.logger.info("New trading day recorded in statistics")
 
         except Exception as e:
             self.logger.error(f"Error monitoring daily performance: {str(e)}")
-            if hasattr(self, 'status_manager'):
+            if self.status_manager is not None:
                 self.status_manager.log_action(f"Error in daily monitoring: {str(e)}")
 
     def track_daily_compliance(self, account_info: Dict):
@@ -630,31 +902,32 @@ class FTMORuleManager:
             account_info: Current account information dictionary
         """
         try:
-            current_time = datetime.now()
+            current_time = self._tick()
             
             # Calculate current metrics
-            daily_loss = abs(account_info['profit'])
-            total_loss = abs(account_info['balance'] - account_info['equity'])
-            daily_limit = abs(self.rules['trading_rules']['max_daily_loss'])
-            total_limit = abs(self.rules['trading_rules']['max_total_loss'])
+            profit = account_info['profit']
+            total_loss = account_info['balance'] - account_info['equity']
+            daily_loss = -profit if profit < 0 else profit
+            total_loss = -total_loss if total_loss < 0 else total_loss
+            daily_limit = self._max_daily_loss_abs
+            total_limit = self._max_total_loss_abs
             
             # Get open positions
-            positions = self.position_manager.get_open_positions() if hasattr(self, 'position_manager') else []
+            positions = self._positions_snapshot()
             active_positions = len(positions)
             
             # Calculate warning thresholds (80% of limits)
-            daily_warning = daily_limit * 0.8
-            total_warning = total_limit * 0.8
+            daily_warning = self._daily_warn_level
+            total_warning = self._total_warn_level
             
             # Get current session info if available
-            market_session = "Unknown"
-            if hasattr(self.mt5_trader, '_get_current_session'):
-                market_session = self.mt5_trader._get_current_session()
+            market_session = self._cached_session()
 
             # Log comprehensive status
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             ========== FTMO COMPLIANCE STATUS ==========
-            Timestamp: {current_time.strftime('%Y-%m-%d %H:%M:%S')}
+            Timestamp: {current_time.strftime(_TIME_FMT)}
             Market Session: {market_session}
             
             Daily P/L Status:
@@ -671,31 +944,30 @@ class FTMORuleManager:
             
             Position Status:
             - Active Positions: {active_positions}
-            - Max Allowed: {self.rules['trading_rules']['max_positions']}
+            - Max Allowed: {self._max_positions}
             
             Trading Day Status:
             - Trading Day Count: {self._get_trading_days_count()}
-            - Min Required: {self.rules.get('trading_rules', {}).get('min_trading_days', 4)}
+            - Min Required: {self._min_trading_days}
             ============================================
             """)
 
             # Log warnings if approaching limits
             if daily_loss >= daily_warning:
-                self.logger.warning(f"ALERT: Approaching daily loss limit - Current: ${daily_loss:.2f} / Limit: ${daily_limit:.2f}")
+                self.logger.warning("ALERT: Approaching daily loss limit - Current: $%.2f / Limit: $%.2f", daily_loss, daily_limit)
             
             if total_loss >= total_warning:
-                self.logger.warning(f"ALERT: Approaching total loss limit - Current: ${total_loss:.2f} / Limit: ${total_limit:.2f}")
+                self.logger.warning("ALERT: Approaching total loss limit - Current: $%.2f / Limit: $%.2f", total_loss, total_limit)
 
             # Check each open position for duration
-            for position in positions:
-                duration_check = self.check_position_duration(position)
+            for position, duration_check in zip(positions, self.check_positions_duration_batch(positions, current_time)):
                 if duration_check.get('warning', False):
                     self.logger.warning(f"""
                     Position Duration Warning:
                     Ticket: {position['ticket']}
                     Symbol: {position['symbol']}
                     Duration: {duration_check['duration']}
-                    Max Allowed: {self.rules['time_rules']['max_position_duration']}min
+                    Max Allowed: {self._max_duration}min
                     """)
 
         except Exception as e:
@@ -706,36 +978,14 @@ class FTMORuleManager:
         try:
             self.logger.info("Starting trading days tracking...")
             
-            # Get trading activity from last 30 days
-            from datetime import datetime, timedelta
-            start_date = datetime.now() - timedelta(days=30)
-            
             # Use MT5 history orders instead of non-existent method
             if not hasattr(self.mt5_trader, 'get_positions_history'):
-                history_orders = mt5.history_orders_get(
-                    start_date,
-                    datetime.now()
-                )
-                if history_orders is None:
-                    history_orders = []
-                self.logger.info(f"Retrieved {len(history_orders)} historical orders")
-                
-                # Track unique trading days
-                trading_days = set()
-                daily_volumes = {}
-                
-                for order in history_orders:
-                    if order.state == mt5.ORDER_STATE_FILLED:
-                        trade_date = datetime.fromtimestamp(order.time_setup).date()
-                        trading_days.add(trade_date)
-                        
-                        # Track volume per day
-                        if trade_date not in daily_volumes:
-                            daily_volumes[trade_date] = 0
-                        daily_volumes[trade_date] += order.volume_initial
+                # Trading activity and volume per day from the last 30 days
+                trading_days, daily_volumes = self._scan_history_30d()
+                daily_volumes = dict(daily_volumes)
 
                 # Calculate required days
-                required_days = self.rules['trading_rules'].get('min_trading_days', 4)
+                required_days = self._min_trading_days
                 days_completed = len(trading_days)
                 days_remaining = max(0, required_days - days_completed)
 
@@ -745,16 +995,17 @@ class FTMORuleManager:
                     'days_remaining': days_remaining,
                     'daily_volumes': daily_volumes,
                     'status': 'COMPLIANT' if days_completed >= required_days else 'PENDING',
-                    'trading_dates': sorted(list(trading_days))
+                    'trading_dates': sorted(trading_days)
                 }
 
-                self.logger.info(f"""
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(f"""
                 Trading Days Status:
                 Completed Days: {days_completed}
                 Required Days: {required_days}
                 Remaining Days: {days_remaining}
                 Status: {result['status']}
-                Trading Dates: {', '.join(d.strftime('%Y-%m-%d') for d in result['trading_dates'])}
+                Trading Dates: {', '.join(map(date.isoformat, result['trading_dates']))}
                 """)
 
                 return result
@@ -763,8 +1014,8 @@ class FTMORuleManager:
             self.logger.error(f"Error tracking trading days: {str(e)}", exc_info=True)
             return {
                 'days_completed': 0,
-                'days_required': self.rules['trading_rules'].get('min_trading_days', 4),
-                'days_remaining': self.rules['trading_rules'].get('min_trading_days', 4),
+                'days_required': self._min_trading_days,
+                'days_remaining': self._min_trading_days,
                 'status': 'ERROR',
                 'error': str(e)
             }
@@ -776,6 +1027,7 @@ class FTMORuleManager:
         """
         try:
             self.logger.info("Starting drawdown monitoring...")
+            now = datetime.now()
             
             account_info = self.mt5_trader.get_account_info()
             
@@ -783,31 +1035,29 @@ class FTMORuleManager:
             current_balance = account_info['balance']
             current_equity = account_info['equity']
             
-            # Initialize peak balance and daily high if not exists
-            if not hasattr(self, 'peak_balance'):
-                self.peak_balance = current_balance
-                self.logger.info(f"Initialized peak balance: ${self.peak_balance:.2f}")
-                
-            if not hasattr(self, 'daily_equity_high'):
-                self.daily_equity_high = current_equity
-                self.logger.info(f"Initialized daily equity high: ${self.daily_equity_high:.2f}")
+            # Initialize or raise peak balance
+            first_peak = self.peak_balance is None
+            if self._update_peak_balance(current_balance):
+                if first_peak:
+                    self.logger.info("Initialized peak balance: $%.2f", self.peak_balance)
+                else:
+                    self.logger.info("New peak balance recorded: $%.2f", self.peak_balance)
 
-            # Update peak balance if needed
-            if current_balance > self.peak_balance:
-                self.peak_balance = current_balance
-                self.logger.info(f"New peak balance recorded: ${self.peak_balance:.2f}")
+            if self.daily_equity_high is None:
+                self.daily_equity_high = current_equity
+                self.logger.info("Initialized daily equity high: $%.2f", self.daily_equity_high)
 
             # Calculate drawdown amounts
             absolute_drawdown = self.peak_balance - current_equity
-            percentage_drawdown = (absolute_drawdown / self.peak_balance * 100) if self.peak_balance else 0
+            percentage_drawdown = self._safe_pct(absolute_drawdown, self.peak_balance)
             
             # Update daily high if needed
             if current_equity > self.daily_equity_high:
                 self.daily_equity_high = current_equity
-                self.logger.info(f"New daily equity high: ${self.daily_equity_high:.2f}")
+                self.logger.info("New daily equity high: $%.2f", self.daily_equity_high)
                 
             daily_drawdown = self.daily_equity_high - current_equity
-            daily_drawdown_percent = (daily_drawdown / self.daily_equity_high * 100) if self.daily_equity_high else 0
+            daily_drawdown_percent = self._safe_pct(daily_drawdown, self.daily_equity_high)
 
             result = {
                 'current_drawdown': absolute_drawdown,
@@ -819,9 +1069,10 @@ class FTMORuleManager:
                 'status': self._get_drawdown_status(percentage_drawdown)
             }
 
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             Drawdown Monitoring Update:
-            Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            Time: {now.strftime(_TIME_FMT)}
             Peak Balance: ${self.peak_balance:.2f}
             Current Equity: ${current_equity:.2f}
             Absolute Drawdown: ${absolute_drawdown:.2f}
@@ -840,15 +1091,26 @@ class FTMORuleManager:
                 'status': 'ERROR'
             }
 
+    def _update_peak_balance(self, balance: float) -> bool:
+        """Raise peak_balance to balance if higher; returns True when it changed"""
+        if self.peak_balance is not None and balance <= self.peak_balance:
+            return False
+        self.peak_balance = balance
+        # Drawdown of _HIGH_DRAWDOWN_PERCENT or more from this peak, as an absolute level
+        if balance > 0:
+            self._high_drawdown_level = balance * (1 - _HIGH_DRAWDOWN_PERCENT / 100)
+        else:
+            self._high_drawdown_level = float('-inf')
+        return True
+
+    @staticmethod
+    def _safe_pct(numerator: float, denominator: float) -> float:
+        """Percentage of numerator over denominator, 0.0 when denominator is zero"""
+        return (numerator / denominator * 100.0) if denominator else 0.0
+
     def _get_drawdown_status(self, drawdown_percent: float) -> str:
         """Helper method to determine drawdown status"""
-        if drawdown_percent >= 9:  # 90% of max drawdown
-            return 'CRITICAL'
-        elif drawdown_percent >= 7:  # 70% of max drawdown
-            return 'WARNING'
-        elif drawdown_percent >= 5:  # 50% of max drawdown
-            return 'CAUTION'
-        return 'NORMAL'
+        return _DRAWDOWN_LABELS[bisect_right(_DRAWDOWN_THRESHOLDS, drawdown_percent)]
 
     def track_profit_target(self) -> Dict:
         """
@@ -857,13 +1119,14 @@ class FTMORuleManager:
         """
         try:
             self.logger.info("Starting profit target tracking...")
+            now = datetime.now()
             
             account_info = self.mt5_trader.get_account_info()
-            profit_target = self.rules['trading_rules'].get('profit_target', 1000)
+            profit_target = self._profit_target
             
             # Calculate current profit
             current_profit = account_info['profit']
-            progress_percent = (current_profit / profit_target * 100) if profit_target else 0
+            progress_percent = self._safe_pct(current_profit, profit_target)
             
             result = {
                 'current_profit': current_profit,
@@ -874,9 +1137,10 @@ class FTMORuleManager:
             }
 
             # Log profit tracking
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             Profit Target Tracking:
-            Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            Time: {now.strftime(_TIME_FMT)}
             
             Progress:
             - Current Profit: ${current_profit:.2f}
@@ -898,77 +1162,83 @@ class FTMORuleManager:
 
     def _get_profit_status(self, progress_percent: float) -> str:
         """Helper method to determine profit status"""
-        if progress_percent >= 100:
-            return 'TARGET_REACHED'
-        elif progress_percent >= 75:
-            return 'NEAR_TARGET'
-        elif progress_percent >= 50:
-            return 'ON_TRACK'
-        return 'IN_PROGRESS'
-
-    def monitor_ftmo_status(self) -> Dict:
+        return _PROFIT_LABELS[bisect_right(_PROFIT_THRESHOLDS, progress_percent)]
+
+    def monitor_ftmo_status(self) -> FTMOStatus:
         """
         Monitor FTMO compliance status even during closed markets
-        Returns: Dict with full status details
+        Returns: FTMOStatus with full status details (see FTMOStatus.to_dict)
         """
         try:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            account_info = self.mt5_trader.get_account_info()
+            now = datetime.now()
 
             # Get market status
-            is_weekend = datetime.now().weekday() >= 5
+            is_weekend = self._is_weekend(now)
+            if is_weekend and self._last_status_cache is not None:
+                taken_at, cached_status = self._last_status_cache
+                if now - taken_at < _WEEKEND_STATUS_TTL:
+                    return cached_status
+
+            timestamp = now.strftime(_TIME_FMT)
+            account_info = self.mt5_trader.get_account_info()
             market_message = "CLOSED - Weekend" if is_weekend else "CLOSED - After Hours"
 
             # Calculate trading day status
             trading_days = self._get_trading_days_count()
-            days_remaining = max(0, self.rules.get('trading_rules', {}).get('min_trading_days', 4) - trading_days)
+            days_remaining = max(0, self._min_trading_days - trading_days)
 
             # Calculate account metrics
             current_balance = account_info['balance']
             current_equity = account_info['equity']
-            daily_loss_limit = abs(self.rules['trading_rules']['max_daily_loss'])
-            total_loss_limit = abs(self.rules['trading_rules']['max_total_loss'])
+            profit = account_info['profit']
+            daily_loss_used = -profit if profit < 0 else profit
+            daily_loss_limit = self._max_daily_loss_abs
+            total_loss_limit = self._max_total_loss_abs
 
             # Update peak balance if needed
-            if not hasattr(self, 'peak_balance') or current_balance > self.peak_balance:
-                self.peak_balance = current_balance
+            self._update_peak_balance(current_balance)
             
-            drawdown = self.peak_balance - current_equity if hasattr(self, 'peak_balance') else 0
-            drawdown_percent = (drawdown / self.peak_balance * 100) if self.peak_balance else 0
+            drawdown = self.peak_balance - current_equity
+            drawdown_percent = self._safe_pct(drawdown, self.peak_balance)
 
-            status = {
-                'market_status': market_message,
-                'timestamp': timestamp,
-                'account_status': {
-                    'balance': current_balance,
-                    'equity': current_equity,
-                    'daily_loss_used': abs(account_info['profit']),
-                    'daily_loss_limit': daily_loss_limit,
-                    'total_loss_limit': total_loss_limit,
-                    'drawdown': drawdown,
-                    'drawdown_percent': drawdown_percent
-                },
-                'trading_progress': {
-                    'days_completed': trading_days,
-                    'days_remaining': days_remaining,
-                    'min_required': self.rules.get('trading_rules', {}).get('min_trading_days', 4)
-                },
-                'rules_status': {
-                    'position_duration_limit': f"{self.rules['time_rules']['max_position_duration']} minutes",
-                    'max_positions': self.rules['trading_rules']['max_positions']
-                },
-                'warnings': []
-            }
+            min_required = self._min_trading_days
+            rules_status = RulesStatus(
+                position_duration_limit=f"{self._max_duration} minutes",
+                max_positions=self._max_positions
+            )
 
             # Add relevant warnings
-            if drawdown_percent >= 8:  # 80% of 10% max drawdown
-                status['warnings'].append(f"High Drawdown Level: {drawdown_percent:.2f}%")
-
-            if abs(account_info['profit']) >= daily_loss_limit * 0.8:
-                status['warnings'].append(f"Approaching Daily Loss Limit: {abs(account_info['profit']):.2f}/{daily_loss_limit:.2f}")
+            warnings = []
+            if current_equity <= self._high_drawdown_level:
+                warnings.append(f"High Drawdown Level: {drawdown_percent:.2f}%")
+
+            if daily_loss_used >= self._daily_warn_level:
+                warnings.append(f"Approaching Daily Loss Limit: {daily_loss_used:.2f}/{daily_loss_limit:.2f}")
+
+            status = FTMOStatus(
+                timestamp=timestamp,
+                market_status=market_message,
+                account_status=AccountStatus(
+                    balance=current_balance,
+                    equity=current_equity,
+                    daily_loss_used=daily_loss_used,
+                    daily_loss_limit=daily_loss_limit,
+                    total_loss_limit=total_loss_limit,
+                    drawdown=drawdown,
+                    drawdown_percent=drawdown_percent
+                ),
+                trading_progress=TradingProgress(
+                    days_completed=trading_days,
+                    days_remaining=days_remaining,
+                    min_required=min_required
+                ),
+                rules_status=rules_status,
+                warnings=warnings
+            )
 
             # Log detailed status
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             ========== FTMO STATUS MONITORING ==========
             Timestamp: {timestamp}
             Market Status: {market_message}
@@ -976,32 +1246,51 @@ class FTMORuleManager:
             Account Status:
             - Balance: ${current_balance:.2f}
             - Equity: ${current_equity:.2f}
-            - Daily Loss Used: ${abs(account_info['profit']):.2f} / ${daily_loss_limit:.2f}
+            - Daily Loss Used: ${daily_loss_used:.2f} / ${daily_loss_limit:.2f}
             - Current Drawdown: ${drawdown:.2f} ({drawdown_percent:.2f}%)
             
             Trading Progress:
             - Days Completed: {trading_days}
             - Days Remaining: {days_remaining}
-            - Minimum Required: {status['trading_progress']['min_required']}
+            - Minimum Required: {min_required}
 
             FTMO Rules:
-            - Position Duration Limit: {status['rules_status']['position_duration_limit']}
-            - Maximum Positions: {status['rules_status']['max_positions']}
+            - Position Duration Limit: {rules_status.position_duration_limit}
+            - Maximum Positions: {rules_status.max_positions}
 
             Warnings:
-            {chr(10).join(status['warnings']) if status['warnings'] else 'None'}
+            {chr(10).join(warnings) if warnings else 'None'}
             =============================================
             """)
 
+            # Only weekend snapshots are reused, so never keep a weekday one around
+            self._last_status_cache = (now, status) if is_weekend else None
             return status
 
         except Exception as e:
             self.logger.error(f"Error monitoring FTMO status: {str(e)}", exc_info=True)
-            return {
-                'error': str(e),
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
+            return FTMOStatus(
+                timestamp=datetime.now().strftime(_TIME_FMT),
+                error=str(e)
+            )
     
+    def _is_weekend(self, now: datetime) -> bool:
+        """Weekend flag for now's date, recomputed only on day rollover"""
+        today = now.date()
+        if self._weekend_cache[0] != today:
+            self._weekend_cache = (today, today.weekday() >= 5)
+        return self._weekend_cache[1]
+
+    def _activity_rule_fields(self, data: Dict) -> Dict:
+        """Rule limits and derived values referenced by the activity templates"""
+        return {
+            'max_position_duration': self._max_duration,
+            'daily_loss_limit': self._max_daily_loss_abs,
+            'total_loss_limit': self._max_total_loss_abs,
+            'abs_daily_loss': abs(data.get('daily_loss', 0)),
+            'abs_total_loss': abs(data.get('total_loss', 0))
+        }
+
     def log_trading_activity(self, activity_type: str, data: Dict):
         """
         Log detailed trading activity with FTMO compliance checks
@@ -1010,8 +1299,21 @@ class FTMORuleManager:
             activity_type: Type of activity ('POSITION_OPEN', 'POSITION_CLOSE', 'DURATION_CHECK', 'LOSS_CHECK')
             data: Dictionary containing activity details
         """
+        if activity_type in ('POSITION_OPEN', 'POSITION_CLOSE'):
+            self._invalidate_positions()
+        if activity_type == 'POSITION_CLOSE':
+            # A closing fill by this bot makes today a trading day before the next scan
+            self._history_daily_volumes.setdefault(date.today(), 0.0)
+            self.invalidate_trading_days_cache()
+        if activity_type == 'POSITION_OPEN':
+            self.daily_stats['positions_opened'] = self.daily_stats.get('positions_opened', 0) + 1
+
+        # Everything below is INFO output; skip the MT5 follow-up calls when filtered
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         try:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            timestamp = datetime.now().strftime(_TIME_FMT)
             
             # Basic activity logging
             self.logger.info(f"""
@@ -1021,52 +1323,22 @@ class FTMORuleManager:
             """)
 
             # Log specific activity details based on type
+            template = _ACTIVITY_TEMPLATES.get(activity_type)
+            if template:
+                self.logger.info(template.format_map(ChainMap(
+                    self._activity_rule_fields(data), data, _ACTIVITY_DEFAULTS
+                )))
+
             if activity_type == 'POSITION_OPEN':
-                self.logger.info(f"""
-                New Position:
-                Symbol: {data.get('symbol')}
-                Type: {data.get('type')}
-                Volume: {data.get('volume')}
-                Entry Price: {data.get('entry_price')}
-                SL: {data.get('stop_loss')}
-                TP: {data.get('take_profit')}
-                """)
-                
                 # Check position count
-                positions = self.mt5_trader.get_positions() if hasattr(self, 'mt5_trader') else []
-                self.logger.info(f"Total Positions: {len(positions)}/{self.rules['trading_rules']['max_positions']}")
+                positions = self._positions_snapshot()
+                self.logger.info("Total Positions: %d/%s", len(positions), self._max_positions)
 
             elif activity_type == 'POSITION_CLOSE':
-                self.logger.info(f"""
-                Closed Position:
-                Ticket: {data.get('ticket')}
-                Symbol: {data.get('symbol')}
-                Profit/Loss: ${data.get('profit', 0):.2f}
-                Duration: {data.get('duration')}
-                """)
-                
                 # Check daily loss limit
-                account_info = self.mt5_trader.get_account_info() if hasattr(self, 'mt5_trader') else {'profit': 0}
+                account_info = self.mt5_trader.get_account_info() if self.mt5_trader is not None else {'profit': 0}
                 daily_loss = abs(account_info['profit'])
-                self.logger.info(f"Daily P/L: ${-daily_loss:.2f}/{self.rules['trading_rules']['max_daily_loss']}")
-
-            elif activity_type == 'DURATION_CHECK':
-                self.logger.info(f"""
-                Duration Check:
-                Ticket: {data.get('ticket')}
-                Symbol: {data.get('symbol')}
-                Current Duration: {data.get('duration')}
-                Max Allowed: {self.rules['time_rules']['max_position_duration']}min
-                Status: {data.get('status', 'OK')}
-                """)
-
-            elif activity_type == 'LOSS_CHECK':
-                self.logger.info(f"""
-                Loss Check:
-                Daily Loss: ${abs(data.get('daily_loss', 0)):.2f}/{abs(self.rules['trading_rules']['max_daily_loss'])}
-                Total Loss: ${abs(data.get('total_loss', 0)):.2f}/{abs(self.rules['trading_rules']['max_total_loss'])}
-                Status: {data.get('status', 'OK')}
-                """)
+                self.logger.info("Daily P/L: $%.2f/%s", -daily_loss, self._max_daily_loss)
 
             self.logger.info("==========================================")
 
@@ -1079,53 +1351,53 @@ class FTMORuleManager:
         Returns Dict with current status and any violations
         """
         try:
-            if not hasattr(self, 'mt5_trader') or not self.mt5_trader:
+            if not self.mt5_trader:
                 self.logger.error("MT5 trader not initialized")
                 return {'error': 'MT5 trader not initialized'}
 
+            # One time snapshot for the whole status pass
+            now = self._tick()
+
             # Get current account info
             account_info = self.mt5_trader.get_account_info()
             
             # Calculate daily stats
             current_profit = account_info['profit']
-            daily_loss_limit = abs(self.rules['trading_rules']['max_daily_loss'])
-            daily_loss_used = (abs(current_profit) / daily_loss_limit) * 100 if current_profit < 0 else 0
+            abs_profit = -current_profit if current_profit < 0 else current_profit
+            daily_loss_limit = self._max_daily_loss_abs
+            daily_loss_used = (abs_profit / daily_loss_limit) * 100 if current_profit < 0 else 0
             
             # Calculate drawdown
-            if not hasattr(self, 'peak_balance'):
-                self.peak_balance = account_info['balance']
-            elif account_info['balance'] > self.peak_balance:
-                self.peak_balance = account_info['balance']
+            self._update_peak_balance(account_info['balance'])
             
             current_drawdown = self.peak_balance - account_info['balance']
-            drawdown_percentage = (current_drawdown / self.peak_balance) * 100 if self.peak_balance else 0
+            drawdown_percentage = self._safe_pct(current_drawdown, self.peak_balance)
             
             # Get active positions with durations
-            positions = self.mt5_trader.get_positions() if hasattr(self.mt5_trader, 'get_positions') else []
-            position_details = []
-            duration_warnings = []
-            
-            for position in positions:
-                duration_check = self.check_position_duration(position)
-                position_details.append({
-                    'ticket': position['ticket'],
-                    'symbol': position['symbol'],
-                    'duration': duration_check['duration'],
-                    'warning': duration_check['warning']
-                })
-                if duration_check['warning']:
-                    duration_warnings.append(f"Position {position['ticket']} duration: {duration_check['duration']}")
+            positions = self._positions_snapshot()
+            checks = [
+                (*_ticket_symbol(position), *_duration_warning(self.check_position_duration(position, now)))
+                for position in positions
+            ]
+            position_details = [
+                {'ticket': ticket, 'symbol': symbol, 'duration': duration, 'warning': warning}
+                for ticket, symbol, duration, warning in checks
+            ]
+            duration_warnings = [
+                f"Position {ticket} duration: {duration}"
+                for ticket, _, duration, warning in checks if warning
+            ]
 
             # Get trading days count
             trading_days = self._get_trading_days_count()
             
             # Compile status report
             status = {
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': self._now_str,
                 'daily_performance': {
                     'current_profit': current_profit,
                     'loss_limit_used': f"{daily_loss_used:.2f}%",
-                    'remaining_loss_allowed': daily_loss_limit - abs(current_profit)
+                    'remaining_loss_allowed': daily_loss_limit - abs_profit
                 },
                 'drawdown': {
                     'current_drawdown': current_drawdown,
@@ -1134,12 +1406,12 @@ class FTMORuleManager:
                 },
                 'positions': {
                     'active_count': len(positions),
-                    'max_allowed': self.rules['trading_rules']['max_positions'],
+                    'max_allowed': self._max_positions,
                     'details': position_details
                 },
                 'trading_days': {
                     'count': trading_days,
-                    'required': self.rules.get('trading_rules', {}).get('min_trading_days', 4)
+                    'required': self._min_trading_days
                 },
                 'warnings': []
             }
@@ -1147,13 +1419,14 @@ class FTMORuleManager:
             # Check for warnings/violations
             if daily_loss_used >= 80:
                 status['warnings'].append(f"CRITICAL: Approaching daily loss limit ({daily_loss_used:.2f}%)")
-            if drawdown_percentage >= 8:  # 80% of 10% max drawdown
+            if account_info['balance'] <= self._high_drawdown_level:
                 status['warnings'].append(f"WARNING: High drawdown level ({drawdown_percentage:.2f}%)")
             if duration_warnings:
                 status['warnings'].extend(duration_warnings)
 
             # Log comprehensive status
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             ========== FTMO STATUS UPDATE ==========
             Time: {status['timestamp']}
             
@@ -1185,60 +1458,63 @@ class FTMORuleManager:
             self.logger.error(f"Error monitoring FTMO status: {str(e)}", exc_info=True)
             return {'error': str(e)}
 
-    def check_ftmo_compliance(self, account_info: Dict, position: Dict = None) -> Dict:
+    def check_ftmo_compliance(self, account_info: Dict, position: Dict = None,
+                              include_trading_days: bool = True) -> Dict:
         """
         Comprehensive FTMO rule check
         
         Args:
             account_info: Current account information
             position: Optional current position being considered
+            include_trading_days: Whether to scan order history for the trading days count
             
         Returns:
-            Dict with compliance status and details
+            Dict with compliance status and details. 'trading_days' is left out
+            when not requested or when a loss limit is already breached.
         """
         try:
             self.logger.info("Starting FTMO compliance check...")
-            
+
+            profit = account_info['profit']
+            total_loss = account_info['balance'] - account_info['equity']
+            abs_profit = -profit if profit < 0 else profit
+            abs_total_loss = -total_loss if total_loss < 0 else total_loss
+
+            # Loss limits: a breach is a violation, otherwise 80% of the limit warns
+            violations = []
+            warnings = []
+            for abs_loss, limit, warn_level, name in (
+                (abs_profit, self._max_daily_loss_abs, self._daily_warn_level, "daily"),
+                (abs_total_loss, self._max_total_loss_abs, self._total_warn_level, "total")
+            ):
+                if abs_loss >= limit:
+                    violation = f"{name.capitalize()} loss limit exceeded"
+                    violations.append(violation)
+                    self.logger.error("FTMO Violation: %s", violation)
+                elif abs_loss >= warn_level:
+                    warning = f"Approaching {name} loss limit"
+                    warnings.append(warning)
+                    self.logger.warning("FTMO Warning: %s", warning)
+
             # Initialize compliance result
             compliance = {
-                'compliant': True,
-                'violations': [],
-                'warnings': [],
+                'compliant': not violations,
+                'violations': violations,
+                'warnings': warnings,
                 'daily_loss_status': {
-                    'current': account_info['profit'],
-                    'limit': self.rules['trading_rules']['max_daily_loss'],
-                    'remaining': abs(self.rules['trading_rules']['max_daily_loss']) - abs(account_info['profit'])
+                    'current': profit,
+                    'limit': self._max_daily_loss,
+                    'remaining': self._max_daily_loss_abs - abs_profit
                 },
                 'total_loss_status': {
-                    'current': account_info['balance'] - account_info['equity'],
-                    'limit': self.rules['trading_rules']['max_total_loss'],
-                    'remaining': abs(self.rules['trading_rules']['max_total_loss']) - abs(account_info['balance'] - account_info['equity'])
-                },
-                'trading_days': self._get_trading_days_count()
+                    'current': total_loss,
+                    'limit': self._max_total_loss,
+                    'remaining': self._max_total_loss_abs - abs_total_loss
+                }
             }
-
-            # Check daily loss
-            if abs(account_info['profit']) >= abs(self.rules['trading_rules']['max_daily_loss']):
-                compliance['compliant'] = False
-                violation = "Daily loss limit exceeded"
-                compliance['violations'].append(violation)
-                self.logger.error(f"FTMO Violation: {violation}")
-            elif abs(account_info['profit']) >= abs(self.rules['trading_rules']['max_daily_loss'] * 0.8):
-                warning = "Approaching daily loss limit"
-                compliance['warnings'].append(warning)
-                self.logger.warning(f"FTMO Warning: {warning}")
-
-            # Check total loss
-            total_loss = account_info['balance'] - account_info['equity']
-            if abs(total_loss) >= abs(self.rules['trading_rules']['max_total_loss']):
-                compliance['compliant'] = False
-                violation = "Total loss limit exceeded"
-                compliance['violations'].append(violation)
-                self.logger.error(f"FTMO Violation: {violation}")
-            elif abs(total_loss) >= abs(self.rules['trading_rules']['max_total_loss'] * 0.8):
-                warning = "Approaching total loss limit"
-                compliance['warnings'].append(warning)
-                self.logger.warning(f"FTMO Warning: {warning}")
+            # A breached limit fails the check whatever the trading days; skip the history scan
+            if include_trading_days and not violations:
+                compliance['trading_days'] = self._get_trading_days_count()
 
             # Check position duration if position provided
             if position:
@@ -1249,19 +1525,20 @@ class FTMORuleManager:
                     compliance['compliant'] = False
                     violation = f"Position {position['ticket']} exceeded maximum duration"
                     compliance['violations'].append(violation)
-                    self.logger.error(f"FTMO Violation: {violation}")
+                    self.logger.error("FTMO Violation: %s", violation)
                 elif duration_check['warning']:
                     warning = f"Position {position['ticket']} approaching duration limit"
                     compliance['warnings'].append(warning)
-                    self.logger.warning(f"FTMO Warning: {warning}")
+                    self.logger.warning("FTMO Warning: %s", warning)
 
             # Log compliance status
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             FTMO Compliance Check Results:
             Compliant: {compliance['compliant']}
-            Daily Loss: ${abs(account_info['profit'])} / ${abs(self.rules['trading_rules']['max_daily_loss'])}
-            Total Loss: ${abs(total_loss)} / ${abs(self.rules['trading_rules']['max_total_loss'])}
-            Trading Days: {compliance['trading_days']}
+            Daily Loss: ${abs_profit} / ${self._max_daily_loss_abs}
+            Total Loss: ${abs_total_loss} / ${self._max_total_loss_abs}
+            Trading Days: {compliance.get('trading_days', 'Not checked')}
             Violations: {len(compliance['violations'])}
             Warnings: {len(compliance['warnings'])}
             """)
@@ -1269,40 +1546,92 @@ class FTMORuleManager:
             return compliance
 
         except Exception as e:
-            self.logger.error(f"Error in FTMO compliance check: {str(e)}", exc_info=True)
+            self.logger.error("Error in FTMO compliance check - %s: %s", type(e).__name__, e)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("FTMO compliance check traceback", exc_info=True)
             return {
                 'compliant': False,
                 'violations': [f"Error checking compliance: {str(e)}"],
                 'warnings': []
             }
         
+    def _history_window_start(self) -> datetime:
+        """Start of the 30-day history window, recomputed once per hour"""
+        hour_bucket = int(time.time()) // 3600
+        if self._history_window[0] != hour_bucket:
+            self._history_window = (hour_bucket, datetime.now() - timedelta(days=30))
+        return self._history_window[1]
+
+    def _scan_history_30d(self) -> tuple:
+        """
+        Trading days and filled volume per day over the last 30 days
+
+        Returns (set of trading dates, {date: volume}). A scan is reused for
+        _TRADING_DAYS_TTL seconds on the same day; after that only orders
+        set up within _HISTORY_OVERLAP of the newest one seen are fetched,
+        fills already counted are skipped and days that left the window are
+        pruned.
+        """
+        checked_at = time.monotonic()
+        today = date.today()
+        scanned = self._history_scanned_at
+        daily_volumes = self._history_daily_volumes
+        if scanned is not None and scanned[1] == today and checked_at - scanned[0] < _TRADING_DAYS_TTL:
+            return set(daily_volumes), daily_volumes
+
+        now = datetime.now()
+        start_date = self._history_window_start()
+        last_ts = self._last_history_ts
+        counted = self._history_tickets
+        if last_ts:
+            query_from = max(start_date, datetime.fromtimestamp(last_ts - _HISTORY_OVERLAP))
+        else:
+            query_from = start_date
+
+        # Use MT5's native history orders function
+        history_orders = mt5.history_orders_get(query_from, now)
+        if history_orders is None:
+            history_orders = []
+        self.logger.info("Retrieved %d historical orders", len(history_orders))
+
+        # The overlap returns fills counted by earlier scans; their tickets are skipped
+        new_volumes, new_tickets = _aggregate_fills(history_orders, counted)
+        for trade_date, volume in new_volumes.items():
+            daily_volumes[trade_date] = daily_volumes.get(trade_date, 0) + volume
+        if new_tickets:
+            counted.update(new_tickets)
+            self._last_history_ts = max(last_ts, max(new_tickets.values()))
+            # Tickets set up before the next query start cannot be returned again
+            floor = max(start_date.timestamp(), self._last_history_ts - _HISTORY_OVERLAP)
+            for ticket in [t for t, ts in counted.items() if ts < floor]:
+                del counted[ticket]
+
+        self._prune_history(start_date)
+        self._history_scanned_at = (checked_at, today)
+        return set(daily_volumes), daily_volumes
+
+    def _prune_history(self, start_date: datetime):
+        """Drop days that have left the 30-day window"""
+        cutoff = start_date.date()
+        daily_volumes = self._history_daily_volumes
+        for trade_date in [d for d in daily_volumes if d < cutoff]:
+            del daily_volumes[trade_date]
+
+    def invalidate_trading_days_cache(self):
+        """Force the next trading days lookup to query MT5 history"""
+        self._history_scanned_at = None
+
     def _get_trading_days_count(self) -> int:
-        """Calculate number of trading days in current period"""
+        """
+        Number of trading days in the current 30-day window
+
+        Goes through _scan_history_30d, which reuses its result for
+        _TRADING_DAYS_TTL seconds and otherwise only fetches recent orders.
+        """
         try:
-            self.logger.info("Calculating trading days count...")
-            from datetime import datetime, timedelta
-            
-            start_date = datetime.now() - timedelta(days=30)  # Look back 30 days
-            trading_days = set()  # Use set to count unique days
-            
-            # Use MT5's native history orders function
-            history_orders = mt5.history_orders_get(
-                start_date,
-                datetime.now()
-            )
-            
-            if history_orders is None:
-                history_orders = []
-                
-            self.logger.info(f"Retrieved {len(history_orders)} historical orders")
-            
-            for order in history_orders:
-                if order.state == mt5.ORDER_STATE_FILLED:
-                    trade_date = datetime.fromtimestamp(order.time_setup).date()
-                    trading_days.add(trade_date)
-                    
-            count = len(trading_days)
-            self.logger.info(f"Trading days count: {count} in last 30 days")
+            self._scan_history_30d()
+            count = len(self._history_daily_volumes)
+            self.logger.debug("Trading days count: %d in last 30 days", count)
             return count
                 
         except Exception as e:
@@ -1,18 +1,70 @@
-import json
-from datetime import datetime, time, timedelta
-from typing import Dict, List, Optional
+import logging
+from datetime import date as _date, datetime, time, timedelta, timezone
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 from zoneinfo import ZoneInfo
 import os
+from bisect import bisect_right
+from src.utils.json_utils import json_loads
+
+_EMPTY_SET: FrozenSet[int] = frozenset()
+
+_WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+_UTC = timezone.utc
+_SERVER_TZ = ZoneInfo("Europe/Kiev")  # EET timezone
+
+# Minute-of-week (Monday 00:00 UTC = 0) bounds of the trading week:
+# the market opens Sunday 21:00 UTC and closes Friday 21:00 UTC
+_WEEK_MINUTES = 7 * 1440
+_WEEK_OPEN_MOW = 6 * 1440 + 21 * 60
+_WEEK_CLOSE_MOW = 4 * 1440 + 21 * 60
+
+# Expected (open, close) per session and (start, end) per overlap, checked by verify_session_configuration
+_REQUIRED_SESSIONS = {
+    'Sydney': ('22:00', '07:00'),
+    'Tokyo': ('00:00', '09:00'),
+    'London': ('08:00', '16:00'),
+    'NewYork': ('13:00', '21:00')
+}
+_REQUIRED_OVERLAPS = {
+    'Sydney-Tokyo': ('00:00', '02:00'),
+    'Tokyo-London': ('08:00', '09:00'),
+    'London-NY': ('13:00', '16:00')
+}
+
+class _SessionTimes(NamedTuple):
+    """A session's open/close parsed from its "HH:MM" config"""
+    open_time: time
+    close_time: time
+    open_minutes: int
+    close_minutes: int
 
 class MarketSessionManager:
+    __slots__ = (
+        'config_dir', 'calendar_file', 'calendar_data', 'sessions', 'holidays', 'logger',
+        '_session_times', '_week_open_mows', '_week_open_sessions',
+        '_holiday_ordinals', '_info_cache', '_open_cache', '_verify_cache', '_calendar_mtime'
+    )
+
     def __init__(self, config_dir: str = "config"):
         """Initialize market session manager with calendar data"""
         self.config_dir = config_dir
         self.calendar_file = os.path.join(config_dir, "market_calendar.json")
+        self._calendar_mtime: Optional[int] = None
         self.calendar_data = self._load_calendar()
+        self._apply_calendar()
+        self._verify_cache: Optional[Tuple[Dict, Dict]] = None
+        self._setup_logging()
+
+    def _apply_calendar(self):
+        """Rebuild the session and holiday lookups from calendar_data"""
         self.sessions = self.calendar_data.get("sessions", {})
         self.holidays = self.calendar_data.get("holidays", {})
-        self._setup_logging()
+        self._session_times = self._parse_session_times()
+        self._week_open_mows, self._week_open_sessions = self._build_week_opens()
+        self._holiday_ordinals = self._build_holiday_ordinals()
+        self._info_cache: Tuple[int, Dict] = (-1, {})
+        self._open_cache: Tuple[int, Dict[str, bool]] = (-1, {})
     
     def _setup_logging(self):
         """Setup logging for market session manager"""
@@ -20,147 +72,191 @@ class MarketSessionManager:
         self.logger = setup_logger('MarketSessionManager')
         self.logger.info("MarketSessionManager initialized with logging")
 
+    def _calendar_file_mtime(self) -> Optional[int]:
+        """Modification time of the calendar file in ns, None when it is missing"""
+        try:
+            return os.stat(self.calendar_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
     def _load_calendar(self) -> Dict:
         """Load market calendar from JSON file"""
+        self._calendar_mtime = self._calendar_file_mtime()
         try:
-            with open(self.calendar_file, 'r') as f:
-                return json.load(f)
+            with open(self.calendar_file, 'rb') as f:
+                return json_loads(f.read())
         except FileNotFoundError:
             return {"sessions": {}, "holidays": {}}
 
+    def maybe_reload(self) -> bool:
+        """Reload the calendar if its file changed since the last load; True when reloaded"""
+        if self._calendar_file_mtime() == self._calendar_mtime:
+            return False
+        previous = self.calendar_data
+        try:
+            self.calendar_data = self._load_calendar()
+            self._apply_calendar()
+        except Exception as e:
+            # Keep the calendar already in use; the recorded mtime stops retries until the next edit
+            self.calendar_data = previous
+            self._apply_calendar()
+            self.logger.error(f"Error reloading market calendar: {str(e)}")
+            return False
+        self.logger.info("Market calendar reloaded from %s", self.calendar_file)
+        return True
+
+    def _parse_session_times(self) -> Dict[str, _SessionTimes]:
+        """Parse each session's "HH:MM" open/close once into times and minutes of day"""
+        session_times = {}
+        for session, times in self.sessions.items():
+            open_str, close_str = times["open"], times["close"]
+            open_h, open_m = int(open_str[:2]), int(open_str[3:])
+            close_h, close_m = int(close_str[:2]), int(close_str[3:])
+            session_times[session] = _SessionTimes(
+                time(open_h, open_m),
+                time(close_h, close_m),
+                open_h * 60 + open_m,
+                close_h * 60 + close_m
+            )
+        return session_times
+
+    def _build_week_opens(self) -> Tuple[Tuple[int, ...], Tuple[str, ...]]:
+        """Every session opening in the trading week, as parallel minute-of-week and session tuples sorted by time"""
+        opens = sorted(
+            (mow, session)
+            for session, times in self._session_times.items()
+            for mow in (day * 1440 + times.open_minutes for day in range(7))
+            if mow < _WEEK_CLOSE_MOW or mow >= _WEEK_OPEN_MOW
+        )
+        return tuple(mow for mow, _ in opens), tuple(session for _, session in opens)
+
+    def _build_holiday_ordinals(self) -> Dict[str, FrozenSet[int]]:
+        """Map "year:session" to the ordinals of its holiday dates"""
+        return {
+            f"{year}:{session}": frozenset(
+                _date.fromisoformat(holiday["date"]).toordinal() for holiday in holidays
+            )
+            for year, sessions in self.holidays.items()
+            for session, holidays in sessions.items()
+        }
+
     def is_holiday(self, session: str, date: Optional[datetime] = None) -> bool:
         """Check if given date is a holiday for the specified session"""
         if date is None:
             date = datetime.now()
 
-        year = str(date.year)
-        date_str = date.strftime("%Y-%m-%d")
+        return date.toordinal() in self._holiday_ordinals.get(f"{date.year}:{session}", _EMPTY_SET)
+
+    def _session_open_at(self, session: str, now: datetime, weekday: int, current_minutes: int) -> bool:
+        """Check whether a session is open at an already-read UTC time"""
+        if weekday >= 5:
+            # Only the Sunday evening Sydney/Tokyo opens trade on the weekend
+            return weekday == 6 and (
+                (session == "Sydney" and now.hour >= 21) or
+                (session == "Tokyo" and now.hour >= 22)
+            )
+        if self.is_holiday(session, now):
+            return False
+        times = self._session_times[session]
+        if times.open_minutes > times.close_minutes:
+            # Session crosses midnight
+            return current_minutes >= times.open_minutes or current_minutes < times.close_minutes
+        return times.open_minutes <= current_minutes < times.close_minutes
 
-        if year in self.holidays and session in self.holidays[year]:
-            return any(holiday["date"] == date_str 
-                      for holiday in self.holidays[year][session])
-        return False
+    def _sessions_open(self, now: datetime, weekday: int, current_minutes: int) -> List[bool]:
+        """Open state of every session, in _session_times order"""
+        return [
+            self._session_open_at(session, now, weekday, current_minutes)
+            for session in self._session_times
+        ]
 
     def is_session_open(self, session: str) -> bool:
-        """Check if a trading session is currently open with enhanced logging"""
-        self.logger.info(f"""
-        ================ SESSION CHECK START ================
-        Session: {session}
-        Current Time: {datetime.now()}
-        UTC Time: {datetime.now(ZoneInfo("UTC"))}
-        Server Time: {datetime.now(ZoneInfo("Europe/Kiev"))}  # EET timezone
-        """)
-        
+        """Check if a trading session is currently open"""
         if session not in self.sessions:
             self.logger.error(f"Session {session} not found in configuration")
             return False
 
-        now = datetime.now(ZoneInfo("UTC"))
-        
-        # Log detailed time information
-        self.logger.info(f"""
-        Time Check:
-        Current UTC: {now}
-        Weekday: {now.weekday()} ({now.strftime('%A')})
-        Hour: {now.hour}
-        Minute: {now.minute}
-        Session Config: {self.sessions[session]}
-        
-        Time Conversions:
-        - UTC: {now}
-        - Local: {datetime.now()}
-        - Server (EET): {datetime.now(ZoneInfo("Europe/Kiev"))}
-        """)
-        
-        # Weekend check with special Sydney handling
-        if now.weekday() >= 5:  # 5 is Saturday, 6 is Sunday
-            self.logger.info(f"Weekend Check - Day: {now.weekday()}")
-            
-            if now.weekday() == 6:  # Sunday
-                if session == "Sydney" and now.hour >= 21:
-                    self.logger.info("Sunday after 21:00 UTC - Sydney session OPEN")
-                    return True
-                elif session == "Tokyo" and now.hour >= 22:
-                    self.logger.info("Sunday after 22:00 UTC - Tokyo session OPEN")
-                    return True
-                else:
-                    self.logger.info(f"Sunday but conditions not met for {session}")
-                    self.logger.info(f"Hour: {now.hour}, Required: >= 21 for Sydney, >= 22 for Tokyo")
-            
-            self.logger.info(f"Weekend restriction applies for {session}")
-            return False
-                
-        # Holiday check
-        if self.is_holiday(session):
-            self.logger.info(f"Holiday detected for {session}")
-            return False
+        now = datetime.now(_UTC)
 
-        # Session time check
-        session_times = self.sessions[session]
-        open_time = datetime.strptime(session_times["open"], "%H:%M").time()
-        close_time = datetime.strptime(session_times["close"], "%H:%M").time()
-        current_time = now.time()
-
-        self.logger.info(f"""
-        Session Time Check:
-        Open Time: {open_time}
-        Close Time: {close_time}
-        Current Time: {current_time}
-        Timezone: UTC
-        Is Cross-Midnight: {open_time > close_time}
-        """)
+        # Open state only changes on minute boundaries; answer repeat polls from the cache
+        minute_key = int(now.timestamp()) // 60
+        cached_minute, cached_states = self._open_cache
+        if cached_minute == minute_key and session in cached_states:
+            return cached_states[session]
 
-        # Handle sessions that cross midnight
-        is_open = False
-        if open_time > close_time:
-            is_open = current_time >= open_time or current_time <= close_time
-            self.logger.info(f"Cross-midnight session check: {is_open}")
-        else:
-            is_open = open_time <= current_time <= close_time
-            self.logger.info(f"Same-day session check: {is_open}")
+        # Weekend and holiday checks come first inside _session_open_at
+        weekday = now.weekday()
+        is_open = self._session_open_at(session, now, weekday, now.hour * 60 + now.minute)
 
-        self.logger.info(f"""
-        ================ SESSION CHECK END ================
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"""
+        ================ SESSION CHECK ================
         Session: {session}
+        Session Config: {self.sessions[session]}
+        Current UTC: {now}
+        Weekday: {weekday} ({_WEEKDAYS[weekday]})
+        Hour: {now.hour}
+        Minute: {now.minute}
+        Local: {now.astimezone().replace(tzinfo=None)}
+        Server (EET): {now.astimezone(_SERVER_TZ)}
         Final Status: {'OPEN' if is_open else 'CLOSED'}
         """)
-        
+
+        if cached_minute != minute_key:
+            self._open_cache = (minute_key, {session: is_open})
+        else:
+            cached_states[session] = is_open
         return is_open
 
     def get_current_session_info(self) -> Dict:
         """Get comprehensive session information with weekend handling"""
-        self.logger.info(f"\n=== Session Info Calculation Start ===")
-        now = datetime.now(ZoneInfo("UTC"))
-        self.logger.info(f"""
+        now = datetime.now(_UTC)
+
+        # Session times have minute resolution, so the result holds for the whole minute
+        minute_key = int(now.timestamp()) // 60
+        if minute_key == self._info_cache[0]:
+            return self._info_cache[1]
+        self.maybe_reload()
+
+        self.logger.info("\n=== Session Info Calculation Start ===")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"""
         Current UTC: {now}
-        Weekday: {now.strftime('%A')}
+        Weekday: {_WEEKDAYS[now.weekday()]}
         Hour: {now.hour}::{now.minute}
         """)
 
         active_sessions = []
         upcoming_sessions = []
+        weekday = now.weekday()
+        current_minutes = now.hour * 60 + now.minute
+        closed_sessions = set()
 
-        # Check each session
-        for session in ['Sydney', 'Tokyo', 'London', 'NewYork']:
-            if self.is_session_open(session):
+        for session, is_open in zip(self._session_times, self._sessions_open(now, weekday, current_minutes)):
+            if is_open:
                 active_sessions.append(session)
             else:
-                # Calculate time until session opens
-                minutes_until = self._calculate_minutes_until(now.time(), 
-                    datetime.strptime(self.sessions[session]['open'], '%H:%M').time())
-                if minutes_until is not None:
-                    upcoming_sessions.append({
-                        'name': session,
-                        'opens_in': f"{minutes_until // 60}h {minutes_until % 60}m"
-                    })
-
-        # Special handling for Sunday after 21:00 UTC
-        if now.weekday() == 6 and now.hour >= 21:  # Sunday after 21:00 UTC
-            self.logger.info("Sunday after 21:00 UTC - Sydney/Tokyo sessions should be active")
-            if 'Sydney' not in active_sessions and now.hour >= 21:
-                active_sessions.append('Sydney')
-            if 'Tokyo' not in active_sessions and now.hour >= 22:
-                active_sessions.append('Tokyo')
+                closed_sessions.add(session)
+
+        # Openings are pre-sorted by minute-of-week, so walking forward from now (wrapping
+        # into next week) meets each closed session's next open soonest-first
+        open_mows, open_sessions = self._week_open_mows, self._week_open_sessions
+        current_mow = weekday * 1440 + current_minutes
+        count = len(open_mows)
+        start = bisect_right(open_mows, current_mow)
+        for i in range(start, start + count):
+            if not closed_sessions:
+                break
+            idx = i if i < count else i - count
+            session = open_sessions[idx]
+            if session in closed_sessions:
+                closed_sessions.discard(session)
+                minutes_until = open_mows[idx] - current_mow + (0 if i < count else _WEEK_MINUTES)
+                upcoming_sessions.append({
+                    'name': session,
+                    'opens_in': f"{minutes_until // 60}h {minutes_until % 60}m",
+                    'minutes_until': minutes_until
+                })
 
         result = {
             'active_sessions': active_sessions,
@@ -168,20 +264,21 @@ class MarketSessionManager:
             'market_status': 'OPEN' if active_sessions else 'CLOSED - Weekend'
         }
 
-        self.logger.info(f"Final result: {result}")
+        self.logger.info("Final result: %s", result)
+        self._info_cache = (minute_key, result)
         return result
 
-    def _parse_time_string(self, time_str: str) -> int:
-        """Convert time string (e.g., '6h 30m') to minutes"""
-        hours = int(time_str.split('h')[0])
-        minutes = int(time_str.split('h')[1].strip().split('m')[0])
-        return hours * 60 + minutes
-    
     def verify_session_configuration(self) -> Dict:
         """
         Verify all session configurations and overlap periods
         Returns Dict with verification results
         """
+        # The calendar is only replaced wholesale, so a new calendar object means a re-check.
+        # Holding the verified calendar keeps its id from being reused by a later one.
+        calendar = self.calendar_data
+        if self._verify_cache is not None and self._verify_cache[0] is calendar:
+            return self._verify_cache[1]
+
         try:
             self.logger.info("Verifying session configurations...")
             
@@ -191,53 +288,43 @@ class MarketSessionManager:
             }
 
             # Verify main sessions
-            required_sessions = {
-                'Sydney': ('22:00', '07:00'),
-                'Tokyo': ('00:00', '09:00'),
-                'London': ('08:00', '16:00'),
-                'NewYork': ('13:00', '21:00')
-            }
-
-            for session, times in required_sessions.items():
+            for session, times in _REQUIRED_SESSIONS.items():
                 if session not in self.sessions:
                     verification['sessions']['status'] = 'ERROR'
                     verification['sessions']['issues'].append(f'Missing {session} session')
                     continue
 
                 session_config = self.sessions[session]
-                if session_config.get('open') != times[0] or session_config.get('close') != times[1]:
+                configured = (session_config.get('open'), session_config.get('close'))
+                if configured != times:
                     verification['sessions']['status'] = 'WARNING'
                     verification['sessions']['issues'].append(
-                        f"{session} session times mismatch - Expected: {times}, Got: {session_config.get('open')}-{session_config.get('close')}"
+                        f"{session} session times mismatch - Expected: {times}, Got: {configured[0]}-{configured[1]}"
                     )
                 else:
-                    self.logger.info(f"{session} session times verified: {times[0]}-{times[1]}")
+                    self.logger.info("%s session times verified: %s-%s", session, times[0], times[1])
 
             # Verify overlap periods
-            required_overlaps = {
-                'Sydney-Tokyo': ('00:00', '02:00'),
-                'Tokyo-London': ('08:00', '09:00'),
-                'London-NY': ('13:00', '16:00')
-            }
-
             overlap_data = self.calendar_data.get('overlaps', {})
-            for overlap, times in required_overlaps.items():
+            for overlap, times in _REQUIRED_OVERLAPS.items():
                 if overlap not in overlap_data:
                     verification['overlaps']['status'] = 'WARNING'
                     verification['overlaps']['issues'].append(f'Missing {overlap} overlap configuration')
                     continue
 
                 overlap_config = overlap_data[overlap]
-                if overlap_config.get('start') != times[0] or overlap_config.get('end') != times[1]:
+                configured = (overlap_config.get('start'), overlap_config.get('end'))
+                if configured != times:
                     verification['overlaps']['status'] = 'WARNING'
                     verification['overlaps']['issues'].append(
-                        f"{overlap} overlap times mismatch - Expected: {times}, Got: {overlap_config.get('start')}-{overlap_config.get('end')}"
+                        f"{overlap} overlap times mismatch - Expected: {times}, Got: {configured[0]}-{configured[1]}"
                     )
                 else:
-                    self.logger.info(f"{overlap} overlap times verified: {times[0]}-{times[1]}")
+                    self.logger.info("%s overlap times verified: %s-%s", overlap, times[0], times[1])
 
             # Log verification results
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"""
             Session Configuration Verification Results:
             Sessions Status: {verification['sessions']['status']}
             Session Issues: {', '.join(verification['sessions']['issues']) if verification['sessions']['issues'] else 'None'}
@@ -246,6 +333,7 @@ class MarketSessionManager:
             Overlap Issues: {', '.join(verification['overlaps']['issues']) if verification['overlaps']['issues'] else 'None'}
             """)
 
+            self._verify_cache = (calendar, verification)
             return verification
 
         except Exception as e:
@@ -255,69 +343,12 @@ class MarketSessionManager:
                 'overlaps': {'status': 'ERROR', 'issues': [str(e)]}
             }
 
-    def _calculate_minutes_until(self, current: time, target: time) -> int:
-        """Calculate minutes until target time, accounting for weekends and market hours"""
-        try:
-            now = datetime.now(ZoneInfo("UTC"))
-            current_minutes = current.hour * 60 + current.minute
-            target_minutes = target.hour * 60 + target.minute
-            
-            self.logger.info(f"""
-            === Minutes Until Calculation ===
-            Current UTC: {now}
-            Current Day: {now.strftime('%A')}
-            Current Time: {current.strftime('%H:%M')}
-            Target Time: {target.strftime('%H:%M')}
-            Current Minutes: {current_minutes}
-            Target Minutes: {target_minutes}
-            """)
+# Shared managers keyed by config directory
+_MANAGERS: Dict[str, MarketSessionManager] = {}
 
-            if now.weekday() == 5:  # Saturday
-                hours_until_sydney = 24 + 21
-                minutes_until_sydney = (hours_until_sydney * 60) - (current.hour * 60 + current.minute)
-                self.logger.info(f"Saturday calculation - Minutes until Sydney: {minutes_until_sydney}")
-
-                if target.hour == 21:  # Sydney
-                    return minutes_until_sydney
-                elif target.hour == 0:  # Tokyo
-                    self.logger.info(f"Tokyo calculation - Adding 180 minutes to Sydney open")
-                    return minutes_until_sydney + 180
-                elif target.hour == 8:  # London
-                    self.logger.info(f"London calculation - Adding 660 minutes to Sydney open")
-                    return minutes_until_sydney + 660
-                elif target.hour == 13:  # New York
-                    self.logger.info(f"New York calculation - Adding 960 minutes to Sydney open")
-                    return minutes_until_sydney + 960
-                    
-            elif now.weekday() == 6:  # Sunday
-                self.logger.info(f"Sunday calculation - Hour: {now.hour}")
-                if now.hour < 21:
-                    minutes_until_sydney = (21 - now.hour) * 60 - now.minute
-                    self.logger.info(f"Before Sydney - Minutes until: {minutes_until_sydney}")
-
-                    if target.hour == 21:  # Sydney
-                        return minutes_until_sydney
-                    elif target.hour == 0:  # Tokyo
-                        return minutes_until_sydney + 180
-                    elif target.hour == 8:  # London
-                        return minutes_until_sydney + 660
-                    elif target.hour == 13:  # New York
-                        return minutes_until_sydney + 960
-                else:
-                    self.logger.info("After Sydney open - Normal calculation")
-                    if target_minutes <= current_minutes:
-                        target_minutes += 24 * 60
-                    minutes_until = target_minutes - current_minutes
-                    self.logger.info(f"Normal calculation result: {minutes_until}")
-                    return minutes_until
-            else:
-                self.logger.info("Weekday calculation")
-                if target_minutes <= current_minutes:
-                    target_minutes += 24 * 60
-                minutes_until = target_minutes - current_minutes
-                self.logger.info(f"Weekday calculation result: {minutes_until}")
-                return minutes_until
-                    
-        except Exception as e:
-            self.logger.error(f"Error calculating session time: {str(e)}")
-            return 0
\ No newline at end of file
+def get_manager(config_dir: str = "config") -> MarketSessionManager:
+    """Return the shared MarketSessionManager for config_dir, creating it on first use"""
+    manager = _MANAGERS.get(config_dir)
+    if manager is None:
+        manager = _MANAGERS[config_dir] = MarketSessionManager(config_dir)
+    return manager
\ No newline at end of file
@@ -1,11 +1,89 @@
 import MetaTrader5 as mt5
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass
 import time
+import operator
+from types import MappingProxyType
+import numpy as np
+from src.utils.time_utils import batch_utc_offset
 
-@dataclass
+def rates_timestamps(times) -> List[datetime]:
+    """
+    Convert an MT5 rates 'time' column to naive local datetimes
+
+    Same values as datetime.fromtimestamp per bar, converted in one NumPy
+    pass when the whole batch shares a UTC offset.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    if not times.size:
+        return []
+    utc_offset = batch_utc_offset(int(times[0]), int(times[-1]))
+    if utc_offset is not None:
+        return (times + utc_offset).astype('datetime64[s]').tolist()
+    return [datetime.fromtimestamp(ts) for ts in times.tolist()]
+
+# Candle dict keys, in rates_to_dicts column order; they match the MarketData fields
+_CANDLE_KEYS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'tick_volume', 'spread')
+
+def rates_to_dicts(rates) -> List[Dict]:
+    """
+    Convert an MT5 rates structured array to candle dicts
+
+    Built column-wise: .tolist() gives Python floats, and the integer
+    volume/spread columns are cast to float.
+    """
+    columns = zip(
+        rates_timestamps(rates['time']),
+        rates['open'].tolist(),
+        rates['high'].tolist(),
+        rates['low'].tolist(),
+        rates['close'].tolist(),
+        rates['real_volume'].astype(float).tolist(),
+        rates['tick_volume'].astype(float).tolist(),
+        rates['spread'].astype(float).tolist()
+    )
+    return [dict(zip(_CANDLE_KEYS, row)) for row in columns]
+
+# MT5 last_error codes a second request cannot fix: invalid params,
+# auth failed, IPC init failed, IPC connect failed
+_RATES_HARD_ERRORS = frozenset((-2, -6, -10003, -10004))
+
+# How long a successful market status check is reused, in seconds
+_STATUS_TTL = 1.0
+
+# Timeframe name -> MT5 constant, shared by every watcher
+_TIMEFRAMES = MappingProxyType({
+    "M1": mt5.TIMEFRAME_M1,
+    "M5": mt5.TIMEFRAME_M5,
+    "M15": mt5.TIMEFRAME_M15,
+    "M30": mt5.TIMEFRAME_M30,
+    "H1": mt5.TIMEFRAME_H1,
+    "H4": mt5.TIMEFRAME_H4,
+    "D1": mt5.TIMEFRAME_D1
+})
+
+# Timeframe name -> bar length
+_TIMEFRAME_DELTAS = MappingProxyType({
+    "M1": timedelta(minutes=1),
+    "M5": timedelta(minutes=5),
+    "M15": timedelta(minutes=15),
+    "M30": timedelta(minutes=30),
+    "H1": timedelta(hours=1),
+    "H4": timedelta(hours=4),
+    "D1": timedelta(days=1)
+})
+
+# Alert condition -> comparison of current price against the alert level
+_ALERT_COMPARATORS = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le
+}
+
+@dataclass(slots=True, frozen=True)
 class MarketData:
     """Container for OHLCV data"""
     timestamp: datetime
@@ -30,15 +108,10 @@ class MarketWatcher:
         self.mt5_instance = mt5_instance
         self._setup_logging()
         self.data_cache: Dict[str, Dict] = {}
-        self.timeframes = {
-            "M1": mt5.TIMEFRAME_M1,
-            "M5": mt5.TIMEFRAME_M5,
-            "M15": mt5.TIMEFRAME_M15,
-            "M30": mt5.TIMEFRAME_M30,
-            "H1": mt5.TIMEFRAME_H1,
-            "H4": mt5.TIMEFRAME_H4,
-            "D1": mt5.TIMEFRAME_D1
-        }
+        self._alerts: Dict[str, Dict] = {}
+        self._alerts_by_symbol: Dict[str, Set[str]] = {}
+        self._status_cache: Tuple[float, Optional[dict]] = (0.0, None)
+        self.timeframes = _TIMEFRAMES
         
     def _setup_logging(self):
         """Setup logging for market watcher"""
@@ -52,8 +125,15 @@ class MarketWatcher:
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.INFO)
 
-    def get_ohlcv_data(self, symbol: str, timeframe: str, bars: int = 100, include_incomplete: bool = False) -> List[MarketData]:
-        """Get OHLCV data for symbol"""
+    def get_ohlcv_data(self, symbol: str, timeframe: str, bars: int = 100, include_incomplete: bool = False,
+                       as_dataclass: bool = True):
+        """
+        Get OHLCV data for symbol
+
+        Returns a list of MarketData, or with as_dataclass=False the MT5 rates
+        structured array as-is (fields time, open, high, low, close,
+        tick_volume, spread, real_volume). Failures return an empty list.
+        """
         self.logger.debug(f"Attempting to get data for {symbol} on {timeframe} timeframe")
         
         if not self.mt5_instance.connected:
@@ -80,34 +160,28 @@ class MarketWatcher:
             if rates is None or len(rates) == 0:
                 error = mt5.last_error()
                 self.logger.error(f"Failed to get rates: Error code {error[0]}, {error[1]}")
-                # Try alternative method
-                rates = mt5.copy_rates_from(symbol, mt5_timeframe, 
-                                        datetime.now(), bars)
+                # Try alternative method, unless the failure is one it would repeat
+                if error[0] not in _RATES_HARD_ERRORS:
+                    rates = mt5.copy_rates_from(symbol, mt5_timeframe,
+                                            datetime.now(), bars)
                     
             if rates is None or len(rates) == 0:
                 self.logger.warning(f"No data available for {symbol} {timeframe}")
                 return []
                 
             self.logger.debug(f"Received {len(rates)} bars of data")
+
+            if not as_dataclass:
+                self.logger.info(f"Retrieved {len(rates)} candles for {symbol} {timeframe}")
+                return rates
             
             # Convert to MarketData objects
-            market_data = []
-            for rate in rates:
-                try:
-                    data = MarketData(
-                        timestamp=datetime.fromtimestamp(rate['time']),
-                        open=float(rate['open']),
-                        high=float(rate['high']),
-                        low=float(rate['low']),
-                        close=float(rate['close']),
-                        volume=float(rate['real_volume']),
-                        tick_volume=float(rate['tick_volume']),
-                        spread=float(rate['spread'])
-                    )
-                    market_data.append(data)
-                except (KeyError, ValueError) as e:
-                    self.logger.error(f"Error converting rate data: {e}")
-                    continue
+            try:
+                candles = rates_to_dicts(rates)
+            except (KeyError, ValueError) as e:
+                self.logger.error(f"Error converting rate data: {e}")
+                return []
+            market_data = [MarketData(**candle) for candle in candles]
                 
             # Log successful data retrieval
             self.logger.info(f"Retrieved {len(market_data)} candles for {symbol} {timeframe}")
@@ -120,13 +194,7 @@ class MarketWatcher:
 
     def _get_timeframe_delta(self, timeframe: str) -> timedelta:
         """Get timedelta for timeframe"""
-        if timeframe.startswith('M'):
-            return timedelta(minutes=int(timeframe[1:]))
-        elif timeframe.startswith('H'):
-            return timedelta(hours=int(timeframe[1:]))
-        elif timeframe == 'D1':
-            return timedelta(days=1)
-        return timedelta(minutes=1)
+        return _TIMEFRAME_DELTAS.get(timeframe, timedelta(minutes=1))
 
     def get_current_price(self, symbol: str) -> Tuple[Optional[float], Optional[float]]:
         """
@@ -199,17 +267,25 @@ class MarketWatcher:
         """
         if not self.mt5_instance.connected:
             return False
+
+        compare = _ALERT_COMPARATORS.get(condition)
+        if compare is None:
+            self.logger.error(f"Invalid alert condition for {symbol}: {condition}")
+            return False
             
         try:
-            # Store alert in cache
+            # Store alert
             alert_key = f"{symbol}_{condition}_{price}"
-            self.data_cache[alert_key] = {
+            self._alerts[alert_key] = {
                 'symbol': symbol,
                 'price': price,
                 'condition': condition,
                 'callback': callback,
-                'active': True
+                'active': True,
+                'compare': compare,
+                'uses_bid': condition in ('<', '<=')
             }
+            self._alerts_by_symbol.setdefault(symbol, set()).add(alert_key)
             return True
             
         except Exception as e:
@@ -226,36 +302,28 @@ class MarketWatcher:
         if not self.mt5_instance.connected:
             return []
             
+        active_alerts = [alert for alert in self._alerts.values() if alert['active']]
+        if not active_alerts:
+            return []
+
+        # One tick per symbol, however many alerts share it
+        prices = {
+            symbol: self.get_current_price(symbol)
+            for symbol in {alert['symbol'] for alert in active_alerts}
+        }
+
         triggered = []
-        for key, alert in list(self.data_cache.items()):
-            if not key.count('_') == 2:  # Not an alert key
-                continue
-                
-            if not alert.get('active', False):
-                continue
-                
+        for alert in active_alerts:
             symbol = alert['symbol']
-            condition = alert['condition']
             alert_price = alert['price']
             
-            current_bid, current_ask = self.get_current_price(symbol)
+            current_bid, current_ask = prices[symbol]
             if current_bid is None or current_ask is None:
                 continue
                 
             # Check if alert should trigger
-            price = current_bid if condition in ['<', '<='] else current_ask
-            should_trigger = False
-            
-            if condition == '>' and price > alert_price:
-                should_trigger = True
-            elif condition == '<' and price < alert_price:
-                should_trigger = True
-            elif condition == '>=' and price >= alert_price:
-                should_trigger = True
-            elif condition == '<=' and price <= alert_price:
-                should_trigger = True
-                
-            if should_trigger:
+            price = current_bid if alert['uses_bid'] else current_ask
+            if alert['compare'](price, alert_price):
                 triggered.append(alert)
                 # Call callback if provided
                 if alert['callback']:
@@ -278,21 +346,24 @@ class MarketWatcher:
         """
         if symbol:
             # Clear alerts for specific symbol
-            for key in list(self.data_cache.keys()):
-                if key.startswith(f"{symbol}_"):
-                    del self.data_cache[key]
+            for key in self._alerts_by_symbol.pop(symbol, ()):
+                self._alerts.pop(key, None)
         else:
             # Clear all alerts
-            for key in list(self.data_cache.keys()):
-                if key.count('_') == 2:  # Alert key
-                    del self.data_cache[key]
+            self._alerts = {}
+            self._alerts_by_symbol = {}
 
     def clear_cache(self):
         """Clear all cached data"""
         self.data_cache.clear()
+        self.clear_alerts()
 
     def _check_market_status(self) -> dict:
         """Detailed market status check with comprehensive logging"""
+        checked_at, cached = self._status_cache
+        if cached is not None and time.monotonic() - checked_at < _STATUS_TTL:
+            return cached
+
         status = {
             'is_open': False,
             'connection_status': False,
@@ -304,13 +375,17 @@ class MarketWatcher:
         try:
             # Check MT5 initialization
             init_status = mt5.initialize()
-            self.logger.info(f"""
+            if self.logger.isEnabledFor(logging.INFO):
+                terminal_info = mt5.terminal_info()
+                symbol_info = mt5.symbol_info("EURUSD")
+                latest_tick = mt5.symbol_info_tick("EURUSD")
+                self.logger.info(f"""
             Market Status Check Debug:
             =========================
             MT5 Initialization: {init_status}
-            Terminal Info: {mt5.terminal_info()._asdict() if mt5.terminal_info() else 'None'}
-            Symbol Info (EURUSD): {mt5.symbol_info("EURUSD")._asdict() if mt5.symbol_info("EURUSD") else 'None'}
-            Latest Tick: {mt5.symbol_info_tick("EURUSD")._asdict() if mt5.symbol_info_tick("EURUSD") else 'None'}
+            Terminal Info: {terminal_info._asdict() if terminal_info else 'None'}
+            Symbol Info (EURUSD): {symbol_info._asdict() if symbol_info else 'None'}
+            Latest Tick: {latest_tick._asdict() if latest_tick else 'None'}
             """)
 
             if not init_status:
@@ -355,6 +430,7 @@ class MarketWatcher:
             }
             
             self.logger.info("Market status check results: %s", status)
+            self._status_cache = (time.monotonic(), status)
             return status
                 
         except Exception as e:
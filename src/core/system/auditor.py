@@ -200,8 +200,8 @@ class SystemAuditor:
                         self.logger.info(f"Log type {req_log} verified")
 
             # 3. Session Management Verification
-            from src.core.market.sessions import MarketSessionManager
-            session_manager = MarketSessionManager()
+            from src.core.market.sessions import get_manager
+            session_manager = get_manager()
             
             # Verify session times
             required_sessions = {
@@ -3,6 +3,7 @@ from datetime import datetime
 import logging
 from .base import SignalProvider, Signal, SignalType
 from .evaluator import SignalEvaluator
+from src.core.market.watcher import rates_to_dicts
 import json
 
 
@@ -234,32 +235,20 @@ class SignalManager:
             List of OHLCV candles with indicators
         """
         try:
-            # Get data from market watcher
-            candles = self.mt5_trader.market_watcher.get_ohlcv_data(
+            # Get data from market watcher as the raw rates array
+            rates = self.mt5_trader.market_watcher.get_ohlcv_data(
                 symbol=symbol,
                 timeframe="H1",  # Default timeframe
                 bars=100,
-                include_incomplete=False
+                include_incomplete=False,
+                as_dataclass=False
             )
             
-            if not candles:
+            if len(rates) == 0:
                 self.logger.warning(f"No market data available for {symbol}")
                 return []
             
-            # Convert MarketData objects to dictionaries
-            return [
-                {
-                    'timestamp': candle.timestamp,
-                    'open': candle.open,
-                    'high': candle.high,
-                    'low': candle.low,
-                    'close': candle.close,
-                    'volume': candle.volume,
-                    'tick_volume': candle.tick_volume,
-                    'spread': candle.spread
-                }
-                for candle in candles
-            ]
+            return rates_to_dicts(rates)
             
         except Exception as e:
             self.logger.error(f"Error getting market data for {symbol}: {str(e)}")
@@ -0,0 +1,16 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+def json_loads(data: bytes):
+    """Parse JSON with orjson when installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def json_dumps_pretty(obj) -> str:
+    """Two-space indented JSON, with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
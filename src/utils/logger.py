@@ -1,12 +1,17 @@
+import atexit
 import logging
+import queue
 from datetime import datetime
 import os
 from typing import Optional, Dict
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # Global dictionary to track logger instances
 _LOGGERS: Dict[str, logging.Logger] = {}
 
+# Background listeners owning the real handlers of async loggers
+_LISTENERS: Dict[str, QueueListener] = {}
+
 def setup_logger(name: str, log_dir: str = 'trading_logs') -> logging.Logger:
     """
     Enhanced logger setup with rotation and cleanup
@@ -116,4 +121,35 @@ def get_implementation_logger(log_dir: str = 'trading_logs') -> logging.Logger:
     logger.setLevel(logging.INFO)
     
     _LOGGERS['Implementation'] = logger
-    return logger
\ No newline at end of file
+    return logger
+
+
+def enable_async_logging(name: str) -> logging.Logger:
+    """
+    Move a logger's handlers onto a background QueueListener thread
+    
+    Args:
+        name: Logger name previously configured via setup_logger
+        
+    Returns:
+        logging.Logger: Same logger, now enqueueing records instead of
+        writing them on the calling thread
+    """
+    logger = setup_logger(name)
+    if name in _LISTENERS or not logger.handlers:
+        return logger
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    _LISTENERS[name] = listener
+    return logger
+
+@atexit.register
+def _stop_listeners():
+    """Flush queued records to the real handlers on interpreter exit"""
+    for listener in _LISTENERS.values():
+        listener.stop()
+    _LISTENERS.clear()
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+# Local UTC offset changes (DST) are months apart, so timestamps closer than this
+# that share an offset at both ends share it throughout
+_SINGLE_OFFSET_SPAN = 120 * 86400
+
+def batch_utc_offset(first_ts: int, last_ts: int) -> Optional[int]:
+    """
+    Local UTC offset in seconds shared by every timestamp from first_ts to last_ts
+
+    Returns None when the span may cross a DST change; callers then convert
+    each timestamp with datetime.fromtimestamp instead.
+    """
+    if abs(last_ts - first_ts) >= _SINGLE_OFFSET_SPAN:
+        return None
+    offset = datetime.fromtimestamp(first_ts).astimezone().utcoffset()
+    if offset != datetime.fromtimestamp(last_ts).astimezone().utcoffset():
+        return None
+    return int(offset.total_seconds())
@@ -173,7 +173,7 @@ class TradingLogger:
                 f.write(f"Limit: ${abs(compliance_check['total_loss_status']['limit'])}\n")
                 f.write(f"Remaining: ${compliance_check['total_loss_status']['remaining']}\n")
                 
-                f.write(f"\nTrading Days: {compliance_check['trading_days']}\n")
+                f.write(f"\nTrading Days: {compliance_check.get('trading_days', 'Not checked')}\n")
                 f.write(f"{'='*78}\n")
                 
             self.logger.info("FTMO status logged successfully")